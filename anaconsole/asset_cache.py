@@ -0,0 +1,122 @@
+import io
+import pygame as pg
+
+DEFAULT_PACKAGE = "anaconsole.assets"
+
+
+class AssetCache:
+    """
+    Process-wide cache of packaged files, shared by all overlays: the raw bytes of every file, decoded images and fonts.
+    Raw bytes are read once and kept as immutable bytes, which every stream over the file shares until it is written to.
+    Images and fonts returned by the cache are shared between callers and must be treated as read-only,
+    copy images before drawing on them and do not change the style attributes of fonts.
+    Evicting only drops the references held by the cache, assets still in use elsewhere stay alive.
+    """
+    def __init__(self):
+        self._files: dict[tuple[str, str], bytes] = dict()
+        # Images are converted to the display format as soon as a display exists, the flag records whether they were
+        self._images: dict[tuple[str, str], tuple[pg.Surface, bool]] = dict()
+        # (package, file name, size, bold, italic, underline, strikethrough) -> font
+        self._fonts: dict[tuple[str, str, int, bool, bool, bool, bool], pg.font.Font] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_bytes(self, file_name: str, package: str = DEFAULT_PACKAGE) -> bytes:
+        """Returns the contents of the whole file."""
+        key = (package, file_name)
+        data: bytes | None = self._files.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        import importlib.resources
+        data = importlib.resources.files(package).joinpath(file_name).read_bytes()
+        self._files[key] = data
+        return data
+
+    def open_stream(self, file_name: str, package: str = DEFAULT_PACKAGE) -> io.BytesIO:
+        """
+        Returns a new stream over the cached bytes of the file, for loaders that need a file object.
+        The stream shares the cached buffer and only copies it if it is written to.
+        """
+        return io.BytesIO(self.get_bytes(file_name, package))
+
+    def get_image(self, file_name: str, package: str = DEFAULT_PACKAGE) -> pg.Surface:
+        """Returns the decoded image, converted to the display format once a display mode is set."""
+        key = (package, file_name)
+        cached = self._images.get(key)
+        if cached is not None and cached[1]:
+            self.hits += 1
+            return cached[0]
+
+        if cached is None:
+            self.misses += 1
+            image = pg.image.load(self.open_stream(file_name, package), file_name)
+        else:
+            self.hits += 1
+            image = cached[0]
+        converted = pg.display.get_surface() is not None
+        if converted:
+            image = image.convert_alpha()
+        self._images[key] = (image, converted)
+        return image
+
+    def get_font(self, file_name: str, size: int, *, bold: bool = False, italic: bool = False, underline: bool = False,
+                 strikethrough: bool = False, package: str = DEFAULT_PACKAGE) -> pg.font.Font:
+        """Returns the pooled font for this file, size and style, so equal fonts are only created once."""
+        key = (package, file_name, size, bold, italic, underline, strikethrough)
+        font: pg.font.Font | None = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        font = pg.font.Font(self.open_stream(file_name, package), size)
+        font.bold, font.italic, font.underline, font.strikethrough = bold, italic, underline, strikethrough
+        self._fonts[key] = font
+        return font
+
+    def evict(self, file_name: str | None = None, package: str = DEFAULT_PACKAGE) -> None:
+        """Drops everything cached for the file, including its images and fonts, or everything if file_name is None."""
+        if file_name is None:
+            self.clear()
+            return
+        self._files.pop((package, file_name), None)
+        self._images.pop((package, file_name), None)
+        for key in [key for key in self._fonts if key[:2] == (package, file_name)]:
+            del self._fonts[key]
+
+    def evict_fonts(self) -> None:
+        self._fonts.clear()
+
+    def evict_images(self) -> None:
+        self._images.clear()
+
+    def clear(self) -> None:
+        self._files.clear()
+        self._images.clear()
+        self._fonts.clear()
+
+    def get_memory_usage(self) -> dict[str, int]:
+        """
+        Returns the bytes held by the cache. Fonts read their file through a stream that shares the cached bytes,
+        so their entry is the size of the files they use, which is already included in "files" and not extra memory.
+        """
+        return {
+            "files": sum(len(data) for data in self._files.values()),
+            "images": sum(image.get_pitch() * image.get_height() for image, _ in self._images.values()),
+            "fonts": sum(len(self._files.get(key, b"")) for key in {key[:2] for key in self._fonts}),
+        }
+
+    def get_stats_string(self) -> str:
+        usage = self.get_memory_usage()
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"{len(self._files)} files ({usage['files'] / 1024:.1f} KiB), "
+                f"{len(self._images)} images ({usage['images'] / 1024:.1f} KiB), "
+                f"{len(self._fonts)} fonts (sharing {usage['fonts'] / 1024:.1f} KiB of files), "
+                f"{self.hits} hits, {self.misses} misses ({hit_rate:.1%} hit rate)")
+
+
+asset_cache = AssetCache()
@@ -1,14 +1,20 @@
-import importlib.resources
 import io
+from anaconsole.lazy import LazyClassAttribute
+from anaconsole.asset_cache import asset_cache
 
 
 def load_file_stream(file_name: str, package: str = 'anaconsole.assets') -> io.BytesIO:
     """
-    Loads a font file from a package and returns a BytesIO stream, allowing packed files to be read.
+    Returns a BytesIO stream over a file from a package, allowing packed files to be read.
+    The file is only read once per process, see asset_cache.
 
     :param file_name: The name of the file (e.g., "my_font.ttf").
     :param package: The dotted path to the package containing the file.
-    :return: BytesIO object containing the font data.
+    :return: BytesIO object containing the file data.
     """
-    with importlib.resources.open_binary(package, file_name) as file:
-        return io.BytesIO(file.read())
+    return asset_cache.open_stream(file_name, package)
+
+
+def lazy_image(file_name: str) -> LazyClassAttribute:
+    """Class attribute holding an image from the assets, which is only loaded on first access."""
+    return LazyClassAttribute(lambda owner: asset_cache.get_image(file_name))
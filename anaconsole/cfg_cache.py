@@ -0,0 +1,74 @@
+import importlib.util
+import marshal
+import os
+import sys
+from pathlib import Path
+from types import CodeType
+
+
+class CompiledConfigCache:
+    """
+    Caches the code objects of cfg files, keyed on path, modification time and size.
+    If write_to_disk is set, code objects are also stored in a __pycache__ directory next to the cfg file,
+    so they survive restarts.
+    """
+    HEADER_SIZE: int = 20  # Magic number (4 bytes), mtime in ns (8 bytes), size (8 bytes)
+
+    def __init__(self, *, write_to_disk: bool = False):
+        self.write_to_disk: bool = write_to_disk
+        self._code_objects: dict[Path, tuple[int, int, CodeType]] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def get_disk_cache_path(path: Path) -> Path:
+        return path.parent / "__pycache__" / f"{path.name}.{sys.implementation.cache_tag}.cfgc"
+
+    def get_code(self, path: Path) -> CodeType:
+        """Returns the compiled code of the cfg file, compiling it only if it changed. Raises SyntaxError and OSError."""
+        path = path.resolve()
+        stat = path.stat()
+        cached = self._code_objects.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            self.hits += 1
+            return cached[2]
+
+        self.misses += 1
+        code = self.read_from_disk(path, stat.st_mtime_ns, stat.st_size) if self.write_to_disk else None
+        if code is None:
+            code = compile(path.read_text(), str(path), "exec")
+            if self.write_to_disk:
+                self.write_to_disk_cache(path, stat.st_mtime_ns, stat.st_size, code)
+        self._code_objects[path] = (stat.st_mtime_ns, stat.st_size, code)
+        return code
+
+    def read_from_disk(self, path: Path, mtime_ns: int, size: int) -> CodeType | None:
+        try:
+            data: bytes = self.get_disk_cache_path(path).read_bytes()
+        except OSError:
+            return None
+        if (data[:4] != importlib.util.MAGIC_NUMBER
+                or int.from_bytes(data[4:12], "little") != mtime_ns
+                or int.from_bytes(data[12:20], "little") != size):
+            return None
+        try:
+            return marshal.loads(data[self.HEADER_SIZE:])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def write_to_disk_cache(self, path: Path, mtime_ns: int, size: int, code: CodeType) -> None:
+        cache_path: Path = self.get_disk_cache_path(path)
+        data: bytes = (importlib.util.MAGIC_NUMBER
+                       + mtime_ns.to_bytes(8, "little")
+                       + size.to_bytes(8, "little")
+                       + marshal.dumps(code))
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(data)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass  # Caching is best effort, e.g. in read-only directories
+
+    def clear(self) -> None:
+        self._code_objects.clear()
@@ -0,0 +1,40 @@
+from collections import OrderedDict
+from types import CodeType
+from typing import Literal
+
+
+class CodeCache:
+    """LRU cache of compiled code objects, keyed on source text and compile mode."""
+    def __init__(self, max_size: int = 256):
+        self.max_size: int = max_size
+        self._code_objects: OrderedDict[tuple[str, str], CodeType] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def compile(self, source: str, mode: Literal["eval", "exec"]) -> CodeType:
+        """Compiles like the eval and exec builtins do, but returns a cached code object for repeated sources."""
+        key = (source, mode)
+        code: CodeType | None = self._code_objects.get(key)
+        if code is not None:
+            self._code_objects.move_to_end(key)
+            self.hits += 1
+            return code
+
+        self.misses += 1
+        # eval() ignores leading spaces and tabs, compile() does not
+        code = compile(source.lstrip(" \t") if mode == "eval" else source, "<string>", mode)
+        self._code_objects[key] = code
+        while len(self._code_objects) > self.max_size:
+            self._code_objects.popitem(last=False)
+            self.evictions += 1
+        return code
+
+    def clear(self) -> None:
+        self._code_objects.clear()
+
+    def get_stats_string(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"{len(self._code_objects)}/{self.max_size} code objects, {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evictions ({hit_rate:.1%} hit rate)")
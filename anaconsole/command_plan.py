@@ -0,0 +1,181 @@
+import inspect
+import types
+import weakref
+import pygame as pg
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Any, Literal, Union, get_type_hints, get_origin, get_args
+
+
+Converter = Callable[[str], Any]
+
+
+def convert_bool(arg: str) -> bool:
+    if arg.lower() in ("1", "true", "yes", "on"):
+        return True
+    if arg.lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"could not convert string to bool: '{arg}'")
+
+
+def split_components(arg: str) -> list[str]:
+    """Splits strings like "1,2", "1 2" or "(1, 2)" into their components."""
+    return arg.strip("()[] ").replace(",", " ").split()
+
+
+def convert_vector2(arg: str) -> pg.Vector2:
+    components = split_components(arg)
+    if len(components) != 2:
+        raise ValueError(f"could not convert string to Vector2: '{arg}'")
+    return pg.Vector2(float(components[0]), float(components[1]))
+
+
+def convert_color(arg: str) -> pg.Color:
+    components = split_components(arg)
+    if len(components) in (3, 4):
+        return pg.Color(*(int(component) for component in components))
+    return pg.Color(arg)  # Color names and hex codes
+
+
+# Converters for types that cannot be constructed from a string directly. Extend with register_converter.
+CONVERTERS: dict[Any, Converter] = {
+    bool: convert_bool,
+    pg.Vector2: convert_vector2,
+    pg.Color: convert_color,
+}
+
+
+def register_converter(param_type: Any, converter: Converter) -> None:
+    """Registers a converter for arguments annotated with param_type."""
+    CONVERTERS[param_type] = converter
+    _plans.clear()
+
+
+def get_type_name(param_type: Any) -> str:
+    if hasattr(param_type, "__name__") and not get_args(param_type):
+        return param_type.__name__
+    return str(param_type).replace(" ", "").replace("typing.", "")
+
+
+def make_enum_converter(enum_type: type[Enum]) -> Converter:
+    def convert_enum(arg: str) -> Enum:
+        for member in enum_type:
+            if member.name.lower() == arg.lower() or str(member.value) == arg:
+                return member
+        raise ValueError(f"{arg} is not a valid {enum_type.__name__}")
+    return convert_enum
+
+
+def make_literal_converter(values: tuple[Any, ...]) -> Converter:
+    def convert_literal(arg: str) -> Any:
+        for value in values:
+            if str(value) == arg:
+                return value
+        raise ValueError(f"{arg} is not one of {', '.join(str(value) for value in values)}")
+    return convert_literal
+
+
+def make_union_converter(member_types: tuple[Any, ...]) -> Converter:
+    # str matches everything, so it is tried last
+    converters = [make_converter(member_type) for member_type in sorted(member_types, key=lambda t: t is str)
+                  if member_type is not type(None)]
+    accepts_none: bool = type(None) in member_types
+
+    def convert_union(arg: str) -> Any:
+        if accepts_none and arg == "None":
+            return None
+        for converter in converters:
+            try:
+                return converter(arg)
+            except (ValueError, TypeError):
+                continue
+        return arg
+    return convert_union
+
+
+def make_converter(param_type: Any) -> Converter:
+    if param_type in CONVERTERS:
+        return CONVERTERS[param_type]
+    if param_type is inspect.Parameter.empty or param_type is Any or param_type is str:
+        return str
+    origin = get_origin(param_type)
+    if origin is Literal:
+        return make_literal_converter(get_args(param_type))
+    if origin is Union or origin is types.UnionType:
+        return make_union_converter(get_args(param_type))
+    if isinstance(param_type, type) and issubclass(param_type, Enum):
+        return make_enum_converter(param_type)
+    return param_type
+
+
+@dataclass(frozen=True)
+class ParameterPlan:
+    name: str
+    converter: Converter
+    type_name: str
+    default: Any = inspect.Parameter.empty
+
+
+class CommandPlan:
+    """
+    Everything handle_command needs to know about a command's parameters, computed once per function:
+    one converter per positional parameter, the number of required arguments and the varargs converter.
+    """
+    def __init__(self, func: Callable[..., Any]):
+        try:
+            type_hints: dict[str, Any] = get_type_hints(func)
+        except (NameError, TypeError):
+            type_hints = dict()
+
+        self.parameters: list[ParameterPlan] = []
+        self.varargs: ParameterPlan | None = None
+        self.required_count: int = 0
+        for param_name, param in inspect.signature(func).parameters.items():
+            param_type = type_hints.get(param_name, inspect.Parameter.empty)
+            parameter_plan = ParameterPlan(param_name,
+                                           make_converter(param_type),
+                                           "undef" if param_type is inspect.Parameter.empty else get_type_name(param_type),
+                                           param.default)
+            if param.kind is inspect.Parameter.VAR_POSITIONAL:
+                self.varargs = parameter_plan
+            elif param.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+                self.parameters.append(parameter_plan)
+                if param.default is inspect.Parameter.empty:
+                    self.required_count += 1
+
+        self.usage_string: str = self.build_usage_string(func, type_hints)
+
+    def convert_args(self, args: list[str]) -> list[Any]:
+        """Converts the arguments to the parameter types. Raises ValueError if an argument cannot be converted."""
+        cast_args: list[Any] = [parameter.converter(arg) for arg, parameter in zip(args, self.parameters)]
+        if self.varargs is not None:
+            cast_args.extend(self.varargs.converter(arg) for arg in args[len(self.parameters):])
+        return cast_args
+
+    def build_usage_string(self, func: Callable[..., Any], type_hints: dict[str, Any]) -> str:
+        aliases = getattr(func, "_aliases", None)
+        string = f"Usage: {'/'.join(aliases)} " if aliases else f"Usage: {func.__name__} "
+        for parameter in self.parameters + ([self.varargs] if self.varargs else []):
+            param_default = parameter.default if parameter.default is not inspect.Parameter.empty else None
+            if type(param_default) is str:
+                param_default = "'" + param_default + "'"
+            prefix = "*" if parameter is self.varargs else ""
+            string += f"<{parameter.type_name} {prefix}{parameter.name}{'=' + str(param_default) if param_default else ''}> "
+        return_type_name = get_type_name(type_hints["return"]) if "return" in type_hints else "undef"
+        string += f"-> {return_type_name}" if return_type_name != "NoneType" else ""
+        return string
+
+
+_plans: weakref.WeakKeyDictionary[Callable[..., Any], CommandPlan] = weakref.WeakKeyDictionary()
+
+
+def get_command_plan(func: Callable[..., Any]) -> CommandPlan:
+    """Returns the cached plan of a command. Bound methods share the plan of their function."""
+    key = getattr(func, "__func__", func)
+    try:
+        plan = _plans.get(key)
+    except TypeError:  # Not weak-referenceable, e.g. builtins
+        return CommandPlan(func)
+    if plan is None:
+        plan = _plans[key] = CommandPlan(func)
+    return plan
@@ -0,0 +1,103 @@
+import queue
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from anaconsole.headless_console import HeadlessConsole
+
+
+@dataclass(eq=False)
+class QueuedCommand:
+    command: str
+    future: Future
+    suppress_logging: bool = False
+    on_output: Callable[[str], None] | None = None
+    callback: Callable[[Future], None] | None = None
+    output: list[str] = field(default_factory=list)
+
+
+class CommandQueue:
+    """
+    Lets any thread submit console commands, which are run on the main thread by process() once per frame.
+    submit() returns a Future whose result is the list of lines the command printed to the log. If the command
+    raises, the exception is printed to the log and set on the future. Callbacks passed to submit() are called by process()
+    on the main thread, also for futures cancelled by the submitter, once process() reaches them. Callbacks added with
+    Future.add_done_callback() instead run on whichever thread finishes or cancels the future.
+    """
+    COMMAND_BUDGET_US: int = 4000
+
+    def __init__(self, dev_console: "HeadlessConsole"):
+        self.dev_console: "HeadlessConsole" = dev_console
+        self.command_budget_us: int = self.COMMAND_BUDGET_US
+        self._submitted: queue.SimpleQueue[list[QueuedCommand]] = queue.SimpleQueue()
+        self._ready: deque[QueuedCommand] = deque()  # Only accessed by the main thread
+        self.current: QueuedCommand | None = None  # The command that is running right now
+        dev_console.log.listeners.append(self.on_log_line)
+
+    def submit(self, command: str, *, suppress_logging: bool = False, on_output: Callable[[str], None] | None = None,
+               callback: Callable[[Future], None] | None = None) -> Future:
+        """
+        Queues a command. on_output is called with every line the command prints, callback with the finished future.
+        Both are called on the main thread by process(). Safe to call from any thread.
+        """
+        return self.submit_batch((command,), suppress_logging=suppress_logging, on_output=on_output, callback=callback)[0]
+
+    def submit_batch(self, commands: Iterable[str], *, suppress_logging: bool = False,
+                     on_output: Callable[[str], None] | None = None,
+                     callback: Callable[[Future], None] | None = None) -> list[Future]:
+        """Queues several commands at once. They run in order, without commands of other threads in between."""
+        batch: list[QueuedCommand] = []
+        for command in commands:
+            # The callback is not added to the future, Future.cancel() would run it on the cancelling thread
+            batch.append(QueuedCommand(command, Future(), suppress_logging, on_output, callback))
+        if batch:
+            self._submitted.put(batch)
+        return [queued_command.future for queued_command in batch]
+
+    def on_log_line(self, string: str) -> None:
+        if self.current is not None:
+            self.current.output.append(string)
+            if self.current.on_output is not None:
+                self.current.on_output(string)
+
+    def process(self) -> int:
+        """
+        Runs queued commands until the time budget of this frame is used up and returns how many ran.
+        At least one command runs every frame. Must be called from the main thread.
+        """
+        deadline_ns: int = perf_counter_ns() + self.command_budget_us * 1000
+        count: int = 0
+        while count == 0 or perf_counter_ns() < deadline_ns:
+            if not self._ready:
+                try:
+                    self._ready.extend(self._submitted.get_nowait())
+                except queue.Empty:
+                    break
+            queued_command = self._ready.popleft()
+            if not queued_command.future.set_running_or_notify_cancel():
+                self.run_callback(queued_command)  # Cancelled by the submitter
+                continue
+            count += 1
+            self.current = queued_command
+            try:
+                self.dev_console.handle_command(queued_command.command, suppress_logging=queued_command.suppress_logging)
+            except Exception as e:
+                self.dev_console.print_exception_to_log(e)
+                self.current = None
+                queued_command.future.set_exception(e)
+            else:
+                self.current = None
+                queued_command.future.set_result(queued_command.output)
+            self.run_callback(queued_command)
+        return count
+
+    def run_callback(self, queued_command: QueuedCommand) -> None:
+        if queued_command.callback is None:
+            return
+        try:
+            queued_command.callback(queued_command.future)
+        except Exception as e:
+            self.dev_console.print_exception_to_log(e)
@@ -1,12 +1,17 @@
 import pygame as pg
 import sys
+from typing import TYPE_CHECKING, Iterable, Callable, Generator
 from types import SimpleNamespace
-from .elements.dev_console import DeveloperConsole, Logger, OutputRedirector
+from .elements.dev_console import DeveloperConsole, Logger
+from .headless_console import OutputRedirector
 from .elements import BaseElement, Autocomplete
-from .assets import load_file_stream
+from .asset_cache import asset_cache
+from .frame_stats import FrameTimeStats
+from .profiler import Profiler, Zone
+from .elements.frame_time_graph import FrameTimeGraph
+if TYPE_CHECKING:
+    from .remote_console import RemoteConsoleServer
 from anaconsole import MOUSEMOTION_2
-from collections import deque
-from time import perf_counter
 
 
 class DeveloperOverlay(BaseElement):
@@ -28,53 +33,272 @@ class DeveloperOverlay(BaseElement):
                  secondary_font_override: pg.font.Font | None = None,
                  logger_font_override: pg.font.Font | None = None,
                  target_framerate: float | None = None,
+                 autoexec: Iterable[str] = (),
+                 cache_cfg_bytecode_on_disk: bool = False,
+                 warm_up_process_pool: bool = False,
+                 lazy_ui: bool = False,
+                 build_ui_in_background: bool = False,
                  ) -> None:
+        """
+        With lazy_ui, only the command registry, the keybinds and the stdout capture exist after construction.
+        Fonts and widgets are built the first time the console is opened or something needs them.
+        build_ui_in_background implies lazy_ui and builds them one piece per render() instead, starting with the second.
+        """
         super().__init__(self, None, pg.Rect((0, 0), surface.get_size()))
         self.surface = surface
-        self.font = primary_font_override or pg.font.Font(load_file_stream("clacon2.ttf"), 20)
-        self.font2 = secondary_font_override or pg.font.Font(load_file_stream("trebuc.ttf"), 12)
+        self._font_overrides: tuple[pg.font.Font | None, pg.font.Font | None, pg.font.Font | None] = (
+            primary_font_override, secondary_font_override, logger_font_override)
 
-        self.cheats_enabled: bool = enable_cheats
-
-        self._logger = Logger(self.surface, font_override=logger_font_override)
-        self.open: bool = False
+        self._logger: Logger | None = None
+        self._open: bool = False
         self.in_tab_mode: bool = False
-
-        self.char_width = self.font.render("A", False, (255, 255, 255)).get_width()
-        self.char_height = self.font.get_height()
         self.border_offset = 4
 
-        self.autocomplete = Autocomplete(self, (0, 0))
-        self.dev_console = DeveloperConsole(self)
+        # Built by build_ui()
+        self.ui_built: bool = False
+        self._ui_builder: Generator[None, None, None] | None = None
+        self._build_ui_in_background: bool = build_ui_in_background
+        self._font: pg.font.Font | None = None
+        self._font2: pg.font.Font | None = None
+        self._char_width: int = 0
+        self._char_height: int = 0
+        self._autocomplete: Autocomplete | None = None
+        self._frame_time_graph: FrameTimeGraph | None = None
+
+        self.dev_console = DeveloperConsole(self, namespaces, enable_cheats=enable_cheats,
+                                            cache_cfg_bytecode_on_disk=cache_cfg_bytecode_on_disk)
         self.children.append(self.dev_console)
 
         self._developer_mode: bool = False
-        self._show_fps: bool = False
-        self._start_time: float = perf_counter()
+        self._show_fps: int = 0  # 1: FPS and max frame time, 2: percentiles and stutters, 3: frame time graph
+        self._show_redraw_count: bool = False
+        self.redrawn_element_count: int = 0  # Number of elements that were actually redrawn during the last frame
         self._target_framerate: float | None = target_framerate
         self._frame_time_buffer_time_seconds: float = 3.0
         self._frame_time_buffer_length: int = max(1, int(self._frame_time_buffer_time_seconds * self._target_framerate)) if self._target_framerate is not None else 100
-        self._frame_times_ms: deque[int] = deque(maxlen=self._frame_time_buffer_length)
+        self.frame_stats: FrameTimeStats = FrameTimeStats(self._frame_time_buffer_length, self._target_framerate)
+        self.profiler: Profiler = Profiler(self._frame_time_buffer_length)
+        # Reused for every MOUSEMOTION, the elements only read it while it is being dispatched
+        self._mouse_motion2: pg.event.Event = pg.event.Event(MOUSEMOTION_2, pos=(0, 0), rel=(0, 0), buttons=(0, 0, 0))
+        # While closed, only keybinds and pinned windows can react to events. Other event types are ignored right away.
+        self._pinned_windows: list[BaseElement] = []  # Refreshed every frame by render()
+        self._closed_event_handlers: dict[int, Callable[[pg.event.Event], bool]] = {
+            pg.KEYDOWN: self._handle_closed_keydown,
+            pg.KEYUP: self._handle_closed_keyup,
+            pg.TEXTINPUT: self._handle_closed_key_event,
+            pg.MOUSEWHEEL: self._handle_closed_key_event,
+            pg.MOUSEMOTION: self._handle_closed_mouse_event,
+            pg.MOUSEBUTTONDOWN: self._handle_closed_mouse_event,
+            pg.MOUSEBUTTONUP: self._handle_closed_mouse_event,
+        }
+
+        self._output_redirector = OutputRedirector(self._print_output)
+        sys.stdout = self._output_redirector
+
+        self.dev_console.run_autoexec(autoexec)
+        if warm_up_process_pool:
+            self.dev_console.jobs.warm_up_process_pool()
+        if not lazy_ui and not build_ui_in_background:
+            self.build_ui()
+
+    def _build_ui_steps(self) -> Generator[None, None, None]:
+        """Builds the UI one piece at a time, so that building it in the background never stalls a single frame."""
+        primary_font_override, secondary_font_override, logger_font_override = self._font_overrides
+        self._font = primary_font_override or asset_cache.get_font("clacon2.ttf", 20)
+        self._font2 = secondary_font_override or asset_cache.get_font("trebuc.ttf", 12)
+        self._char_width = self._font.render("A", False, (255, 255, 255)).get_width()
+        self._char_height = self._font.get_height()
+        yield
+        self._autocomplete = Autocomplete(self, (0, 0))
+        yield
+        self._logger = Logger(self.surface, font_override=logger_font_override)
+        yield
+        self.dev_console.build_ui()
+        yield
+        self._frame_time_graph = FrameTimeGraph(self, (2, 0), self.frame_stats)
+        self.ui_built = True
+        self._ui_builder = None
+
+    def build_ui(self) -> None:
+        """Builds whatever is left of the fonts and widgets. Does nothing if the UI is already built."""
+        if self.ui_built:
+            return
+        if self._ui_builder is None:
+            self._ui_builder = self._build_ui_steps()
+        for _ in self._ui_builder:
+            pass
+
+    @property
+    def font(self) -> pg.font.Font:
+        if self._font is None:
+            self.build_ui()
+        return self._font
+
+    @property
+    def font2(self) -> pg.font.Font:
+        if self._font2 is None:
+            self.build_ui()
+        return self._font2
+
+    @property
+    def char_width(self) -> int:
+        if self._font is None:
+            self.build_ui()
+        return self._char_width
+
+    @property
+    def char_height(self) -> int:
+        if self._font is None:
+            self.build_ui()
+        return self._char_height
+
+    @property
+    def autocomplete(self) -> Autocomplete:
+        if self._autocomplete is None:
+            self.build_ui()
+        return self._autocomplete
+
+    @property
+    def open(self) -> bool:
+        return self._open
+
+    @open.setter
+    def open(self, value: bool) -> None:
+        if value:
+            self.build_ui()
+        self._open = value
+
+    def _print_output(self, text: str) -> None:
+        self.dev_console.log.print(text)
+        if self._logger is not None:
+            self._logger.print(text)
+
+    def start_remote_console(self, host: str = "127.0.0.1", port: int | None = None, *,
+                             unix_socket_path: str | None = None) -> "RemoteConsoleServer":
+        """See HeadlessConsole.start_remote_console()."""
+        return self.dev_console.start_remote_console(host, port, unix_socket_path=unix_socket_path)
+
+    @property
+    def remote_console(self) -> "RemoteConsoleServer | None":
+        return self.dev_console.remote_console
+
+    @property
+    def namespace(self) -> SimpleNamespace:
+        return self.dev_console.namespace
 
-        self.namespace = SimpleNamespace(
-            dev_console=self.dev_console,
-            main=sys.modules["__main__"],
-            pg=pg,
-            **namespaces if namespaces else dict(),
-        )
-        sys.stdout = OutputRedirector(self.dev_console.log.print, self._logger.print)
+    @property
+    def cheats_enabled(self) -> bool:
+        return self.dev_console.cheats_enabled
+
+    @cheats_enabled.setter
+    def cheats_enabled(self, value: bool) -> None:
+        self.dev_console.cheats_enabled = value
+
+    def zone(self, name: str) -> Zone:
+        """
+        Returns the profiling zone with the given name, for use as a context manager or decorator:
+        `with overlay.zone("physics"): ...` or `@overlay.zone("render")`. Zones nest and are shown by the profiler command.
+        """
+        return self.profiler.zone(name)
+
+    def process_events(self, events: Iterable[pg.event.Event]) -> list[pg.event.Event]:
+        """
+        Handles a frame's worth of events and returns the ones the overlay did not consume, in their original order.
+        Consecutive MOUSEMOTION events are merged into the first of them (rel summed up, pos and buttons of the last),
+        so the element tree sees one motion per frame no matter the polling rate of the mouse.
+        """
+        unhandled_events: list[pg.event.Event] = []
+        motion: pg.event.Event | None = None
+        for event in events:
+            if event.type == pg.MOUSEMOTION:
+                if motion is None:
+                    motion = event
+                else:
+                    motion.rel = (motion.rel[0] + event.rel[0], motion.rel[1] + event.rel[1])
+                    motion.pos = event.pos
+                    motion.buttons = event.buttons
+                continue
+            if motion is not None:
+                self._dispatch_event(motion, unhandled_events)
+                motion = None
+            self._dispatch_event(event, unhandled_events)
+        if motion is not None:
+            self._dispatch_event(motion, unhandled_events)
+        return unhandled_events
+
+    def _dispatch_event(self, event: pg.event.Event, unhandled_events: list[pg.event.Event]) -> None:
+        pos = getattr(event, "pos", None)
+        consumed: bool = self._trickle_down_event(event)
+        if pos is not None:
+            event.pos = pos  # The elements rewrite pos to their own coordinates on the way down
+        if not consumed:
+            unhandled_events.append(event)
+
+    def _trickle_down_event(self, event: pg.event.Event) -> bool:
+        if not self.open:
+            handler = self._closed_event_handlers.get(event.type)
+            return handler(event) if handler is not None else False
+        return super()._trickle_down_event(event)
+
+    def _handle_closed_keydown(self, event: pg.event.Event) -> bool:
+        if event.scancode == 53:
+            self.open = True
+            return True
+        self.dev_console.press_keybind(event.key)
+        self.in_tab_mode = False
+        return self._handle_closed_key_event(event)
+
+    def _handle_closed_keyup(self, event: pg.event.Event) -> bool:
+        self.dev_console.release_keybind(event.key)
+        return self._handle_closed_key_event(event)
+
+    def _handle_closed_key_event(self, event: pg.event.Event) -> bool:
+        """Key events only reach a pinned window that was clicked last, e.g. to type into its input boxes."""
+        if not getattr(self.selected_child, "pinned", False):
+            return False
+        if self.autocomplete.show and self.autocomplete.handle_event(event):
+            return True
+        return self.selected_child._trickle_down_event(event)
+
+    def _handle_closed_mouse_event(self, event: pg.event.Event) -> bool:
+        if not self._pinned_windows:
+            return False
+        if event.type == pg.MOUSEMOTION:
+            self._dispatch_mouse_motion2(event, self._pinned_windows)
+        elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            clicked_window = next((window for window in reversed(self._pinned_windows) if window.rect.collidepoint(event.pos)), None)
+            if clicked_window is not self.selected_child:
+                if self.selected_child is not None:
+                    self.selected_child._trickle_down_deselect()
+                self.selected_child = clicked_window
+        if not getattr(self.selected_child, "pinned", False):
+            return False
+        return self.selected_child._trickle_down_event(event)
+
+    def _dispatch_mouse_motion2(self, event: pg.event.Event, children: Iterable[BaseElement]) -> None:
+        """
+        Fires our own MOUSEMOTION_2 event at the children under the previous cursor position.
+        This makes it so that elements can be notified when the cursor moves away from them.
+        """
+        mouse_motion2 = self._mouse_motion2
+        mouse_motion2.rel = event.rel
+        mouse_motion2.buttons = getattr(event, "buttons", (0, 0, 0))
+        previous_pos = (event.pos[0] - event.rel[0], event.pos[1] - event.rel[1])
+        for child in children:
+            if not child.rect.collidepoint(previous_pos):
+                continue
+            mouse_motion2.pos = previous_pos  # Rewritten to child coordinates by the previous dispatch
+            if child._trickle_down_event(mouse_motion2):
+                break
 
     def handle_event(self, event: pg.event.Event) -> bool:
         if event.type == pg.KEYDOWN and event.scancode == 53:
             self.open = not self.open
             return True
 
-        # Handle keybinds if not open. TODO: abtract into DeveloperConsole method?
-        if event.type == pg.KEYDOWN and not self.open:
-            commands: list[str] | None = self.dev_console.keybinds.get(event.key)
-            if commands:
-                for command in commands:
-                    self.dev_console.handle_command(command, suppress_logging=True)
+        # Keys held down while the console was opened still release their + bindings
+        if event.type == pg.KEYUP:
+            self.dev_console.release_keybind(event.key)
 
         # Check if the autocomplete is open. If it is, it has priority over other elements.
         if self.autocomplete.show:
@@ -97,15 +321,8 @@ class DeveloperOverlay(BaseElement):
                 self.in_tab_mode = False
 
         # Lastly, if the event is a MOUSEMOTION event, we immediately fire our own self-made MOUSEMOTION_2 event.
-        # This makes it so that elements can be notified when the cursor moves away from them. Very cursed code block.
         if event.type == pg.MOUSEMOTION:
-            mouse_motion2 = pg.event.Event(MOUSEMOTION_2, event.dict.copy())
-            mouse_motion2.pos = (event.pos[0] - event.rel[0], event.pos[1] - event.rel[1])
-            for child in self.children:
-                if not child.rect.collidepoint(mouse_motion2.pos):
-                    continue
-                if child._trickle_down_event(mouse_motion2):
-                    break
+            self._dispatch_mouse_motion2(event, list(self.get_children_at((event.pos[0] - event.rel[0], event.pos[1] - event.rel[1]))))
 
         return False
 
@@ -129,31 +346,78 @@ class DeveloperOverlay(BaseElement):
         else:
             return 0, 255, 0
 
-    def draw_fps_counter(self, surface: pg.Surface) -> None:
-        if not self._frame_times_ms:
-            return
-        avg_fps = 1000 / (sum(self._frame_times_ms) / len(self._frame_times_ms))
+    def draw_fps_counter(self, surface: pg.Surface, y: int) -> int:
+        """
+        Draws the FPS counter at the given height and returns the height below it.
+        The lines change every frame, so they are rendered directly instead of filling the shared text cache.
+        """
+        if not len(self.frame_stats):
+            return y
+        avg_fps = 1000 / max(self.frame_stats.get_mean(), 1e-6)
         fps_color = self.get_fps_color(avg_fps)
-        max_frame_time = max(self._frame_times_ms)
+        max_frame_time = self.frame_stats.get_max()
         frame_time_color = self.get_frame_time_color(max_frame_time)
 
-        surface.blit(self.font.render(f"FPS: {int(avg_fps)}", True, fps_color), (2, 2))
-        surface.blit(self.font.render(f"MAX: {max_frame_time}ms", True, frame_time_color), (2, 22))
+        surface.blit(self.font.render(f"FPS: {int(avg_fps)}", True, fps_color), (2, y))
+        surface.blit(self.font.render(f"MAX: {max_frame_time:.1f}ms", True, frame_time_color), (2, y + 20))
+        y += 40
+        if self._show_fps >= 2:
+            for percentile, frame_time in self.frame_stats.get_percentiles().items():
+                surface.blit(self.font.render(f"P{percentile:g}: {frame_time:.2f}ms", True, self.get_frame_time_color(frame_time)), (2, y))
+                y += 20
+            if self.frame_stats.budget_ms is not None:
+                over_budget = self.frame_stats.count_over_budget()
+                hitches = self.frame_stats.count_over_budget(self.frame_stats.HITCH_FACTOR)
+                surface.blit(self.font.render(f"STUTTERS: {over_budget} (>{self.frame_stats.HITCH_FACTOR:g}x: {hitches}, TOTAL: {self.frame_stats.total_stutters})", True, self.PRIMARY_TEXT_COLOR), (2, y))
+                y += 20
+        if self._show_fps >= 3:
+            self._frame_time_graph.rect.top = y + 2
+            self._frame_time_graph.render()
+            surface.blit(self._frame_time_graph.surface, self._frame_time_graph.rect)
+            y = self._frame_time_graph.rect.bottom + 2
+        return y
+
+    def draw_redraw_counter(self, surface: pg.Surface, y: int) -> int:
+        surface.blit(self.font.render(f"REDRAWN: {self.redrawn_element_count}", True, self.PRIMARY_TEXT_COLOR), (2, y))
+        return y + 20
+
+    def draw_statistics(self, surface: pg.Surface) -> None:
+        y = 2
+        if self._show_fps:
+            y = self.draw_fps_counter(surface, y)
+        if self._show_redraw_count:
+            self.draw_redraw_counter(surface, y)
+
+    def update(self) -> None:
+        """Collects output and results of background work and runs commands submitted by other threads. Called by render() once per frame."""
+        self._output_redirector.flush_pending()
+        self.dev_console.update()
 
     def render(self) -> None:
+        self.redrawn_element_count = 0
+        self.profiler.end_frame()
+        self.update()
         if self._show_fps:
-            elapsed_time_seconds: float = perf_counter() - self._start_time
-            self._frame_times_ms.append(int(elapsed_time_seconds * 1000))
-            self._start_time = perf_counter()
+            self.frame_stats.tick()
+        if not self.ui_built:
+            if self._show_fps or self._show_redraw_count or self._developer_mode:
+                self.build_ui()
+            elif self._build_ui_in_background:
+                if self._ui_builder is None:
+                    self._ui_builder = self._build_ui_steps()  # Started after the first frame of the game
+                else:
+                    next(self._ui_builder, None)
+                return
+            else:
+                return
 
         if not self.open:
-            for child in self.children:
-                if getattr(child, "pinned", False):
-                    child.render_recursively(self.surface)
+            self._pinned_windows = [child for child in self.children if getattr(child, "pinned", False)]
+            for child in self._pinned_windows:
+                child.render_recursively(self.surface)
             if self._developer_mode:  # todo: duplicate code
                 self._logger.render(self.surface)
-            if self._show_fps:
-                self.draw_fps_counter(self.surface)
+            self.draw_statistics(self.surface)
             if self.autocomplete.show and self.autocomplete.input_box is not None:
                 self.autocomplete.draw()
                 self.surface.blit(self.autocomplete.surface, (
@@ -174,5 +438,4 @@ class DeveloperOverlay(BaseElement):
             self.surface.blit(self.autocomplete.surface, (self.autocomplete.rect.left + self.autocomplete.input_box.get_letter_x(self.autocomplete.position),
                                                      self.autocomplete.rect.top))
 
-        if self._show_fps:
-            self.draw_fps_counter(self.surface)
+        self.draw_statistics(self.surface)
@@ -1,6 +1,7 @@
 import pygame as pg
+from anaconsole.text_cache import text_cache
 from .base_element import BaseElement
-from dataclasses import dataclass
+from anaconsole.headless_console import AutocompleteOption, MAX_AUTOCOMPLETE_OPTIONS, MAX_UNSHORTENED_HINT_LENGTH
 from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
@@ -9,13 +10,9 @@ if TYPE_CHECKING:
 
 class Autocomplete(BaseElement):
     MAX_HINT_LENGTH = 32
-    MAX_UNSHORTENED_HINT_LENGTH = 16
-
-    @dataclass(frozen=True)
-    class Option:
-        name: str
-        type_hint: str
-        italics: bool = True
+    MAX_UNSHORTENED_HINT_LENGTH = MAX_UNSHORTENED_HINT_LENGTH
+    MAX_OPTIONS = MAX_AUTOCOMPLETE_OPTIONS
+    Option = AutocompleteOption
 
     def __init__(self, overlay: "DeveloperOverlay", position: tuple[int, int]):
         super().__init__(overlay, overlay, pg.Rect(position, (1, 1)))
@@ -57,10 +54,10 @@ class Autocomplete(BaseElement):
                 text_color = self.overlay.SECONDARY_TEXT_COLOR
                 hint_color = self.overlay.BORDER_COLOR_LIGHT
             y = i * self.overlay.char_height + surface_border_width
-            self.surface.blit(self.overlay.font.render(option.name, False, text_color, None), (surface_border_width, y))
+            self.surface.blit(text_cache.render(self.overlay.font, option.name, False, text_color, None), (surface_border_width, y))
             type_hint = option.type_hint if len(option.type_hint) <= self.MAX_HINT_LENGTH else option.type_hint[0:self.MAX_HINT_LENGTH-3]+"..."
             if option.italics:
                 self.overlay.font.set_italic(True)
-            self.surface.blit(self.overlay.font.render(type_hint, False, hint_color, None), (surface_width - len(type_hint) * self.overlay.char_width, y))
+            self.surface.blit(text_cache.render(self.overlay.font, type_hint, False, hint_color, None), (surface_width - len(type_hint) * self.overlay.char_width, y))
             self.overlay.font.set_italic(False)
         self.draw_border_rect(self.surface, pg.Rect(0, 0, self.surface.get_width(), self.surface.get_height()))  # TODO: cannot use self.render_border() here
@@ -1,5 +1,6 @@
 import pygame as pg
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Optional, Union, Any, Iterator
+from anaconsole.spatial_index import GridIndex
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
     from anaconsole.elements.window import Window
@@ -7,6 +8,9 @@ if TYPE_CHECKING:
 
 class BaseElement:
     INSET: bool = False
+    ALWAYS_REDRAW: bool = False  # Set for elements whose appearance depends on state that cannot be polled
+    HIT_INDEX_MIN_CHILDREN: int | None = 32  # Hit-test children through a GridIndex from this many children on, None disables
+    HIT_INDEX_CELL_SIZE: int = 64
 
     def __init__(self,
                  overlay: "DeveloperOverlay",
@@ -23,6 +27,10 @@ class BaseElement:
             self.surface.set_colorkey(colorkey)
         self.children: list[BaseElement] = []
         self.selected_child: BaseElement | None = None
+        self.dirty: bool = True
+        self._render_state: Any = None
+        self._hit_index: GridIndex | None = None
+        self._hit_index_child_count: int = 0
 
     def get_absolute_rect(self) -> pg.Rect:
         from anaconsole.dev_overlay import DeveloperOverlay
@@ -55,10 +63,69 @@ class BaseElement:
                 current = current.parent
         return True  # we reached the top of the linked list, so we are the selected object
 
-    def render_recursively(self, surface: pg.Surface):
-        self.render()
+    def mark_dirty(self) -> None:
+        """Forces this element and all of its ancestors to be redrawn on the next frame."""
+        current = self
+        while current is not None:
+            current.dirty = True
+            current = current.parent
+
+    def invalidate_hit_index(self) -> None:
+        """
+        Must be called after children were moved or resized. Adding and removing children is detected automatically,
+        as long as the number of children changes.
+        """
+        self._hit_index = None
+
+    def get_children_at(self, pos: tuple[int, int]) -> Iterator["BaseElement"]:
+        """Yields the children that contain pos (relative to this element), in the order of self.children."""
+        if self.HIT_INDEX_MIN_CHILDREN is None or len(self.children) < self.HIT_INDEX_MIN_CHILDREN:
+            for child in self.children:
+                if child.rect.collidepoint(pos):
+                    yield child
+            return
+        if self._hit_index is None or self._hit_index_child_count != len(self.children):
+            self._hit_index = GridIndex([child.rect for child in self.children], self.HIT_INDEX_CELL_SIZE)
+            self._hit_index_child_count = len(self.children)
+        children = self.children
+        for index in self._hit_index.query_point(pos):
+            if children[index].rect.collidepoint(pos):
+                yield children[index]
+
+    def get_render_state(self) -> Any:
+        """
+        Returns a snapshot of the state that the appearance of this element depends on (excluding its children).
+        The element is redrawn whenever the snapshot changes between two frames.
+        """
+        return self.overlay.in_tab_mode and self.is_selected()
+
+    def poll_dirty(self) -> bool:
+        """Updates the dirty flags of this subtree and returns whether this element has to be redrawn."""
+        if self.ALWAYS_REDRAW:
+            self.dirty = True
+        else:
+            render_state = self.get_render_state()
+            if render_state != self._render_state:
+                self._render_state = render_state
+                self.dirty = True
         for child in self.children:
-            child.render_recursively(self.surface)
+            if child.poll_dirty():
+                self.dirty = True
+        return self.dirty
+
+    def render_recursively(self, surface: pg.Surface):
+        self.poll_dirty()
+        self._render_dirty_recursively(surface)
+
+    def _render_dirty_recursively(self, surface: pg.Surface):
+        # Clean elements simply reuse their cached surface. A dirty element redraws itself and re-blits all children,
+        # since the old image of a changed child might still be visible underneath the new one.
+        if self.dirty:
+            self.render()
+            self.overlay.redrawn_element_count += 1
+            for child in self.children:
+                child._render_dirty_recursively(self.surface)
+            self.dirty = False
         surface.blit(self.surface, self.rect)
 
     def render_body(self):
@@ -104,6 +171,9 @@ class BaseElement:
         self.surface = pg.Surface(size)
         if colorkey:
             self.surface.set_colorkey(colorkey)
+        if self.parent is not None:
+            self.parent.invalidate_hit_index()
+        self.mark_dirty()
 
     def render(self):
         self.render_body()
@@ -164,11 +234,7 @@ class BaseElement:
         # Child selection logic happens here. If LMB is pressed, we iterate over all children and perform collision
         # checks. If a child is found, we mark it as selected and deselect the previously selected child.
         if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-            found_child: BaseElement | None = None
-            for child in self.children:
-                if child.rect.collidepoint(event.pos):
-                    found_child = child
-                    break
+            found_child: BaseElement | None = next(self.get_children_at(event.pos), None)
             if found_child is not self.selected_child:
                 if self.selected_child is not None:
                     self.selected_child._trickle_down_deselect()
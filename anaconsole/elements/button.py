@@ -1,6 +1,6 @@
 import pygame as pg
 from .base_element import BaseElement
-from typing import Callable, TYPE_CHECKING, Optional
+from typing import Callable, TYPE_CHECKING, Optional, Any
 from anaconsole import MOUSEMOTION_2
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
@@ -22,6 +22,9 @@ class Button(BaseElement):
         self.pressed: bool = False
         self.locked: bool = locked
 
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), self.pressed, self.toggle and self.state, self.image
+
     def render_body(self):
         self.surface.fill(self.overlay.PRIMARY_COLOR)
         if self.image:
@@ -1,7 +1,7 @@
 import pygame as pg
-from anaconsole.assets import load_file_stream
+from anaconsole.assets import lazy_image
 from .base_element import BaseElement
-from typing import Callable, TYPE_CHECKING, Optional
+from typing import Callable, TYPE_CHECKING, Optional, Any
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
 
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
 class Checkbox(BaseElement):
     INSET: bool = True
     SIZE = 18
-    CHECK_IMAGE: pg.Surface = pg.image.load(load_file_stream("check.png"))
+    CHECK_IMAGE: pg.Surface = lazy_image("check.png")
 
     def __init__(self, overlay: "DeveloperOverlay", parent: Optional["BaseElement"],
                  position: tuple[int, int],
@@ -26,6 +26,9 @@ class Checkbox(BaseElement):
             return True
         return False
 
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), bool(self.getter())
+
     def render_body(self):
         self.surface.fill(self.overlay.SECONDARY_COLOR)
         if self.getter():
@@ -1,35 +1,67 @@
 import pygame as pg
-import numpy as np
 import colorsys
 import math
-from anaconsole.assets import load_file_stream
+from functools import lru_cache
+from anaconsole.assets import lazy_image
+from anaconsole.lazy import get_numpy
 from .base_element import BaseElement
 from .slider import Slider
 from .button import Button
 from .window import Window
 from .input_box import InputBox
-from typing import Optional, TYPE_CHECKING, Callable
+from typing import Optional, TYPE_CHECKING, Callable, Any
 if TYPE_CHECKING:
+    import numpy
     from anaconsole.dev_overlay import DeveloperOverlay
 
 
+def hsv_to_rgb_array(hue: "numpy.ndarray", saturation: "numpy.ndarray", value: float) -> "numpy.ndarray":
+    """Vectorized version of colorsys.hsv_to_rgb. Returns an array of shape (*hue.shape, 3) with values from 0 to 1."""
+    np = get_numpy()
+    sector = (hue * 6.0).astype(np.int32)
+    f = hue * 6.0 - sector
+    p = value * (1.0 - saturation)
+    q = value * (1.0 - saturation * f)
+    t = value * (1.0 - saturation * (1.0 - f))
+    v = np.full_like(hue, value)
+    sector %= 6
+    conditions = [sector == i for i in range(6)]
+    r = np.select(conditions, [v, q, p, p, t, v])
+    g = np.select(conditions, [t, v, v, q, p, p])
+    b = np.select(conditions, [p, p, t, v, v, q])
+    return np.stack((r, g, b), axis=-1)
+
+
 def generate_color_wheel(size: int) -> pg.Surface:
+    np = get_numpy()
     radius = size // 2
+    # surfarray indexes pixels as [x, y]
+    dx, dy = np.meshgrid(np.arange(size) - radius, np.arange(size) - radius, indexing="ij")
+    distance = np.sqrt(dx ** 2 + dy ** 2) / radius
+    inside = distance <= 1
+    hue = (np.arctan2(-dy, dx) + np.pi) / (2 * np.pi)  # 0 to 1
+    saturation = np.minimum(distance, 1.0)  # 0 to 1
+    rgb = (hsv_to_rgb_array(hue, saturation, 1.0) * 255).astype(np.uint8)
+    rgb[~inside] = 0
+
     surface = pg.Surface((size, size), pg.SRCALPHA)
-    surface.fill((0, 0, 0, 0))
-    for x in range(size):
-        for y in range(size):
-            dx = x - radius
-            dy = y - radius
-            distance = np.sqrt(dx ** 2 + dy ** 2) / radius
-            if distance > 1:
-                continue
-            else:
-                hue = (np.arctan2(-dy, dx) + np.pi) / (2 * np.pi)  # 0 to 1
-                saturation = distance  # 0 to 1
-                rgb = colorsys.hsv_to_rgb(hue, saturation, 1.0)
-                rgb = tuple(int(c * 255) for c in rgb)
-                surface.set_at((x, y), rgb)
+    pg.surfarray.blit_array(surface, rgb)
+    alpha = pg.surfarray.pixels_alpha(surface)
+    alpha[...] = np.where(inside, 255, 0).astype(np.uint8)
+    del alpha  # Unlocks the surface
+    return surface
+
+
+@lru_cache(maxsize=32)
+def get_color_wheel(size: int, value_norm: int = 255) -> pg.Surface:
+    """
+    Returns the color wheel of the given size with all colors multiplied by value_norm / 255.
+    Wheels are generated on first use and shared, so the returned surface must not be modified.
+    """
+    if value_norm == 255:
+        return generate_color_wheel(size)
+    surface = get_color_wheel(size).copy()
+    surface.fill((value_norm, value_norm, value_norm), special_flags=pg.BLEND_RGB_MULT)
     return surface
 
 
@@ -131,8 +163,7 @@ class ColorPicker(BaseElement):
 class ColorWheel(BaseElement):
     SIZE = 200
     WHEEL_SIZE = SIZE
-    COLOR_PICKER_CARET: pg.Surface = pg.image.load(load_file_stream("color_picker_caret.png"))
-    COLOR_WHEEL: pg.Surface = generate_color_wheel(SIZE)
+    COLOR_PICKER_CARET: pg.Surface = lazy_image("color_picker_caret.png")
 
     def __init__(self, overlay: "DeveloperOverlay", parent: Optional["BaseElement"], pos: tuple[int, int],
                  getter: Callable[[], tuple[int, int, int]] = lambda: (0, 0, 0),
@@ -143,14 +174,16 @@ class ColorWheel(BaseElement):
         self.setter: Callable[[tuple[int, int, int]], None] = setter
         caret_x, caret_y, value = self.rgb_to_wheel_coordinates(getter())
         self.caret_position: tuple[int, int] = (caret_x, caret_y)
-        self.color_wheel: pg.Surface = self.COLOR_WHEEL.copy()
+        self.color_wheel: pg.Surface = get_color_wheel(self.WHEEL_SIZE)
         self.draw_color_wheel()
 
     def draw_color_wheel(self, value: float | None = None):
-        self.color_wheel.blit(self.COLOR_WHEEL, (0, 0))
         value: float = colorsys.rgb_to_hsv(*[x/255.0 for x in self.getter()])[2] if value is None else value
         value_norm: int = int(255 * value)
-        self.color_wheel.fill((value_norm, value_norm, value_norm), special_flags=pg.BLEND_RGB_MULT)
+        color_wheel: pg.Surface = get_color_wheel(self.WHEEL_SIZE, value_norm)
+        if color_wheel is not self.color_wheel:
+            self.color_wheel = color_wheel
+            self.mark_dirty()
 
     def rgb_to_wheel_coordinates(self, rgb: tuple[int, int, int]) -> tuple[int, int, float]:
         # Normalize RGB
@@ -189,6 +222,9 @@ class ColorWheel(BaseElement):
             return True
         return False
 
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), tuple(self.caret_position)
+
     def render(self):
         self.surface.fill(self.overlay.PRIMARY_COLOR)
         self.surface.blit(self.color_wheel, (0, 0))
@@ -223,6 +259,9 @@ class ColorButton(Button):
         self.color_getter = getter
         self.color_setter = setter
 
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), tuple(self.color_getter())
+
     def open_color_picker_window(self) -> None:
         color_picker_window = ColorPickerWindow(self.overlay, self.overlay, (300, 500),
                                                 getter=self.color_getter,
@@ -1,71 +1,37 @@
-import shlex
 import time
 import pygame as pg
-import pygame.locals
-import os
-import inspect
-from typing import get_type_hints, TYPE_CHECKING, Callable, Any
-from itertools import islice
-import types
-import sys
-from collections import deque, defaultdict
+import math
+from typing import TYPE_CHECKING, Callable, Iterable
+from collections import deque
 from .base_element import BaseElement
-from .autocomplete import Autocomplete
 from .button import Button
 from .input_box import InputBox
 from .variable_monitor import VariableMonitorWindow
-from pathlib import Path
-import traceback
-from anaconsole.assets import load_file_stream
+from .profiler_window import ProfilerWindow
+from dataclasses import dataclass
+from anaconsole.asset_cache import asset_cache
+from anaconsole.text_cache import text_cache
+from anaconsole.headless_console import HeadlessConsole, LogHistory, console_command
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
 
 
-CommandCarrierType = Any  # Any namespace that contains console commands
-
-
-class OutputRedirector:
-    stdout = sys.stdout
-
-    def __init__(self, *custom_redirects: Callable[[str], None]):
-        self.custom_redirects: tuple[Callable[[str], None], ...] = custom_redirects
-
-    def write(self, text):
-        self.stdout.write(text)
-        if text.strip():  # Ignore empty lines
-            for redirect in self.custom_redirects:
-                redirect(text)
-
-    def flush(self):
-        self.stdout.flush()
-
-
-def console_command(*aliases: str, is_cheat_protected: bool = False, show_return_value: bool = False, autocomplete_function: Callable[[str], tuple[int, list["Autocomplete.Option"]]] | None = None, hint: Callable[[CommandCarrierType], Any] | None = None):
-    # This cursed if statement ensures that the decorator works even when used without parentheses
-    if len(aliases) == 1 and callable(aliases[0]) and not isinstance(aliases[0], str):
-        f = aliases[0]
-        f._is_console_command = True
-        return f
-
-    def decorator(func):
-        func._is_console_command = True
-        func._aliases = aliases
-        func._is_cheat_protected = is_cheat_protected
-        func._show_return_value = show_return_value
-        func._autocomplete_function = autocomplete_function
-        if hint: setattr(func, "_hint", hint)
-        return func
-    return decorator
+class Logger:
+    FADE_STEPS: int = 20  # The layer is only recomposed when a line crosses one of these alpha steps
 
+    @dataclass
+    class Line:
+        text: str
+        timestamp: float
+        surface: pg.Surface | None = None  # Rendered once, the first time the line is shown
 
-class Logger:
     def __init__(self,
                  screen_surface: pg.Surface,
                  max_relative_height: float = 0.3,
                  *,
                  font_override: pg.font.Font | None = None
                  ):
-        self.font: pg.font.Font = font_override or pg.font.Font(load_file_stream("trebuc.ttf"), 18)
+        self.font: pg.font.Font = font_override or asset_cache.get_font("trebuc.ttf", 18)
         max_lines = int(screen_surface.get_height() * max_relative_height / self.font.get_height())
 
         self.surface = pg.Surface((screen_surface.get_width(), max_lines * self.font.get_height()), flags=pg.SRCALPHA)
@@ -75,37 +41,82 @@ class Logger:
         self.fade_start_time = 5.0
         self.fade_duration = 2.0
 
-        self.log: deque[tuple[str, float]] = deque((("", 0.0) for _ in range(max_lines)), maxlen=max_lines)
+        self.log: deque[Logger.Line] = deque(maxlen=max_lines)
+        self._composed_alphas: tuple[int, ...] | None = None
+        self._layer_visible: bool = False
 
     def print(self, text: str):
-        self.log.append((text, time.time()))
+        self.log.append(Logger.Line(text, time.time()))
+        self._composed_alphas = None
+
+    def get_alpha(self, age: float) -> int:
+        if age > self.fade_start_time + self.fade_duration:
+            return 0
+        if age <= self.fade_start_time:
+            return self.max_alpha
+        remaining: float = 1.0 - (age - self.fade_start_time) / self.fade_duration
+        return self.max_alpha * math.ceil(remaining * self.FADE_STEPS) // self.FADE_STEPS
+
+    def compose(self, alphas: tuple[int, ...]) -> None:
+        self.surface.fill((0, 0, 0, 0))
+        blit_sequence: list[tuple[pg.Surface, tuple[int, int]]] = []
+        for i, (line, alpha) in enumerate(zip(reversed(self.log), reversed(alphas))):
+            if alpha == 0:
+                continue
+            if line.surface is None:
+                line.surface = self.font.render(line.text, True, (255, 255, 255))
+            line.surface.set_alpha(alpha)
+            blit_sequence.append((line.surface, (0, self.surface.get_height() - (i+1) * self.font.get_height())))
+        self.surface.fblits(blit_sequence)
+        self._composed_alphas = alphas
+        self._layer_visible = bool(blit_sequence)
 
     def render(self, surface: pg.Surface):
-        self.surface.fill((0, 0, 0, 0))
         current_time: float = time.time()
-        for i, (text, timestamp) in enumerate(reversed(self.log)):
-            age: float = current_time - timestamp
-            if age > self.fade_start_time + self.fade_duration:
-                continue
-            if age > self.fade_start_time:
-                alpha = int(pg.math.lerp(self.max_alpha, 0.0, (age - self.fade_start_time) / self.fade_duration))
-            else:
-                alpha = self.max_alpha
-            font_surface = self.font.render(text, True, (255, 255, 255))
-            font_surface.set_alpha(alpha)
-            self.surface.blit(font_surface, (0, self.surface.get_height() - (i+1) * font_surface.get_height()))
-        surface.blit(self.surface, (0, surface.get_height() - self.surface.get_height()))
+        alphas: tuple[int, ...] = tuple(self.get_alpha(current_time - line.timestamp) for line in self.log)
+        if alphas != self._composed_alphas:
+            self.compose(alphas)
+        if self._layer_visible:
+            surface.blit(self.surface, (0, surface.get_height() - self.surface.get_height()))
 
 
-class DeveloperConsole(BaseElement):
+class DeveloperConsole(HeadlessConsole, BaseElement):
     DEFAULT_HEIGHT = 200
     SUBMIT_BUTTON_WIDTH = 50
-    KEY_MAPPING: dict[str, int] = {name.removeprefix("K_"): getattr(pygame.locals, name) for name in dir(pg.locals) if name.startswith('K_')}
-    INVERT_KEY_MAPPING: dict[int, str] = {value: key for key, value in KEY_MAPPING.items()}
 
-    def __init__(self, overlay: "DeveloperOverlay"):
-        super().__init__(overlay, overlay, pg.Rect(0, 0, overlay.rect.w, self.DEFAULT_HEIGHT))
-        self.keybinds: dict[str|int, list[str]] = defaultdict(list)
+    def __init__(self, overlay: "DeveloperOverlay", namespaces: dict[str, object] | None = None, *,
+                 enable_cheats: bool = False, cache_cfg_bytecode_on_disk: bool = False):
+        BaseElement.__init__(self, overlay, overlay, pg.Rect(0, 0, overlay.rect.w, 0))  # Sized by build_ui()
+        HeadlessConsole.__init__(self, {"pg": pg, **(namespaces or dict())}, enable_cheats=enable_cheats,
+                                 cache_cfg_bytecode_on_disk=cache_cfg_bytecode_on_disk)
+        # Built by build_ui(), which needs the overlay's fonts
+        self.input_box: InputBox | None = None
+        self.log_view: Log | None = None
+
+    # The log colors follow the overlay's theme
+    @property
+    def PRIMARY_TEXT_COLOR(self) -> tuple[int, int, int]:
+        return self.overlay.PRIMARY_TEXT_COLOR
+
+    @property
+    def SECONDARY_TEXT_COLOR(self) -> tuple[int, int, int]:
+        return self.overlay.SECONDARY_TEXT_COLOR
+
+    @property
+    def HIGHLIGHT_COLOR(self) -> tuple[int, int, int]:
+        return self.overlay.HIGHLIGHT_COLOR
+
+    @property
+    def ERROR_COLOR(self) -> tuple[int, int, int]:
+        return self.overlay.ERROR_COLOR
+
+    def build_ui(self) -> None:
+        """Builds the input box, the log view and the submit button. Called by the overlay when it builds its UI."""
+        if self.input_box is not None:
+            return
+        overlay = self.overlay
+        self.rect.h = self.DEFAULT_HEIGHT
+        self.surface = pg.Surface(self.rect.size)
         input_box_height = int(overlay.char_height * 1.5)
         log_width = overlay.rect.w - 2 * overlay.border_offset
         input_box_width = log_width - overlay.border_offset - self.SUBMIT_BUTTON_WIDTH
@@ -120,10 +131,11 @@ class DeveloperConsole(BaseElement):
                                   lose_focus_on_send=False,
                                   autocomplete_function=self.dev_console_autocomplete,
                                   )
-        self.log = Log(overlay, self, pg.Rect(self.overlay.border_offset,
-                                              self.surface.get_height() - self.input_box.surface.get_height() - self.overlay.border_offset,
-                                              log_width,
-                                              max_log_height))
+        self.log_view = Log(overlay, self, pg.Rect(self.overlay.border_offset,
+                                                   self.surface.get_height() - self.input_box.surface.get_height() - self.overlay.border_offset,
+                                                   log_width,
+                                                   max_log_height),
+                            log_history=self.log)
 
         submit_button = Button(overlay, self, pg.Rect(self.rect.right - self.SUBMIT_BUTTON_WIDTH - overlay.border_offset,
                                                       self.input_box.rect.top,
@@ -132,370 +144,55 @@ class DeveloperConsole(BaseElement):
                                self.input_box.enter, image=overlay.font2.render("Submit", False, overlay.PRIMARY_TEXT_COLOR, overlay.PRIMARY_COLOR))
         self.children.append(self.input_box)
         self.children.append(submit_button)
+        self.invalidate_hit_index()
+        self.parent.invalidate_hit_index()
+        self.mark_dirty()
 
-    def dev_console_autocomplete(self, text: str) -> tuple[int, list["Autocomplete.Option"]]:
-        if not text:
-            return 0, []
-        words = text.split(" ", maxsplit=1)
-        if len(words) == 1:
-            position, options = 0, []
-            for command, func in self.get_all_commands().items():
-                command: str
-                if not command.startswith(text) or command == text:
-                    continue
-                retrieved_value = None
-                if hint := getattr(func, "_hint", None):
-                    for command_carrier in self.overlay.namespace.__dict__.values():
-                        try:
-                            retrieved_value = hint(command_carrier)
-                            break
-                        except AttributeError:
-                            continue
-                options.append(Autocomplete.Option(command + " ", str(retrieved_value) if retrieved_value is not None else "", False))
-            return position, options
-        else:
-            position = len(words[0]) + 1
-            command: Callable[[...], Any] | None = self.get_all_commands().get(words[0])
-            if not command:
-                return 0, []
-            autocomplete_function: Callable[[str], list[str]] | None = getattr(command, "_autocomplete_function", None)
-            if not autocomplete_function:
-                return 0, []
-
-            offset, options = 0, []
-            for command_carrier in self.overlay.namespace.__dict__.values():
-                if getattr(command_carrier, autocomplete_function.__name__, None):
-                    offset, options = getattr(command_carrier, autocomplete_function.__name__)(words[1])
-                    break
-            position += offset
-            return position, options
-
-    def print_exception_to_log(self, e: Exception) -> None:
-        self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.overlay.ERROR_COLOR,
-                       mirror_to_stdout=True)
-        for line in traceback.format_exc().split("\n"):
-            self.log.print(line, color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-
-    @staticmethod
-    def exec_cfg_autocomplete(text: str) -> tuple[int, list["Autocomplete.Option"]]:
-        userpath: list[str] = text.split("/")
-        position = text.rfind("/") + 1 if text.rfind("/") != -1 else 0
-        path = Path.cwd() / Path(*userpath)
-        if not path.exists():
-            path = Path.cwd() / Path(*userpath[:-1])
-        if not path.exists():
-            return 0, []
-        if not path.is_dir():
-            return 0, []
-        names = [f.name + '/' if f.is_dir() else f.name for f in path.iterdir() if f.name.startswith(userpath[-1])]
-        if "../".startswith(userpath[-1]): names.append("../")
-        return position, [Autocomplete.Option(name, "") for name in names]
+    def get_line_width(self) -> int:
+        return self.input_box.max_chars if self.input_box is not None else self.DEFAULT_COLUMN_COUNT
 
     @console_command("developer", hint=lambda self: int(self.overlay._developer_mode))
     def set_developer_mode(self, enable: int):
         """If set, print stdout to the screen"""
         self.overlay._developer_mode = bool(enable)
 
-    @console_command("showfps", hint=lambda self: int(self.overlay._show_fps))
-    def set_fps_counter(self, enable: int):
-        """Show or hide the FPS counter"""
-        self.overlay._show_fps = bool(enable)
+    @console_command("showfps", hint=lambda self: self.overlay._show_fps)
+    def set_fps_counter(self, level: int):
+        """Show the FPS counter (1), frame time percentiles (2) and a frame time graph (3), or hide it (0)"""
+        if level and not self.overlay._show_fps:
+            self.overlay.frame_stats.reset()
+        self.overlay._show_fps = max(0, level)
+
+    @console_command("showredraws", hint=lambda self: int(self.overlay._show_redraw_count))
+    def set_redraw_counter(self, enable: int):
+        """Show or hide the number of elements redrawn per frame"""
+        self.overlay._show_redraw_count = bool(enable)
+
+    @console_command("text_cache_stats")
+    def print_text_cache_stats(self):
+        """Prints hit, miss and eviction statistics of the text render cache"""
+        self.log.print(text_cache.get_stats_string(), mirror_to_stdout=True)
+
+    @console_command("asset_cache_stats")
+    def print_asset_cache_stats(self):
+        """Prints the files, images and fonts held by the asset cache and their memory usage"""
+        self.log.print(asset_cache.get_stats_string(), mirror_to_stdout=True)
 
     @console_command("var_monitor", is_cheat_protected=True)
     def open_variable_monitor_window(self):
         """Open the variable monitor window"""
         self.overlay.children.append(VariableMonitorWindow(self.overlay, self.overlay, pg.Rect((200, 200), VariableMonitorWindow.SIZE)))
 
-    @console_command(autocomplete_function=exec_cfg_autocomplete, is_cheat_protected=True)
-    def exec_cfg(self, filepath: str) -> None:
-        """Executes any file containing python code"""
-        path = Path.cwd() / filepath
-        if not path.exists():
-            print(f"Config {filepath} does not exist.")
-            return
-        with open(path, 'r') as file:
-            code = file.read()
-            try:
-                exec(code, None, self.overlay.namespace.__dict__)
-            except Exception as e:
-                self.print_exception_to_log(e)
-
-    @console_command(show_return_value=True)
-    def get_cwd(self) -> str:
-        """Gives the path of the current working directory"""
-        return os.getcwd()
-
-    @console_command("change_cwd", "chdir", show_return_value=False, is_cheat_protected=True)
-    def change_cwd(self, path: str) -> None:
-        """Changes the CWD, relative paths only."""
-        os.chdir(os.path.join(os.getcwd(), path))
-
-    @staticmethod
-    def find_commands(instance: CommandCarrierType) -> dict[str: Callable[..., Any]]:
-        commands: dict[str: Callable[..., Any]] = dict()
-        for name, method in inspect.getmembers(instance, predicate=inspect.ismethod):
-            if not getattr(method, "_is_console_command", False):
-                continue
-            aliases = getattr(method, "_aliases", False)
-            if aliases is not False and len(aliases) > 0:
-                for alias in aliases:
-                    commands[alias] = method
-            else:
-                commands[name] = method
-        return commands
-
-    def get_all_commands(self) -> dict[str: Callable[..., Any]]:
-        all_commands: dict[str: Callable[..., Any]] = dict()
-        for command_carrier in self.overlay.namespace.__dict__.values():
-            all_commands.update(self.find_commands(command_carrier))
-        return all_commands
-
-    def list_all_commands(self):
-        all_commands = self.get_all_commands().keys()
-        if not all_commands:
-            self.log.print("No console commands found.", color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-            return
-        self.log.print("List of all available commands: (type help <command> for help)", mirror_to_stdout=True)
-        column_gap = 2
-        column_width = max(len(command_name) for command_name in all_commands) + column_gap
-        column_count = self.input_box.max_chars // column_width
-        command_iterator = iter(all_commands)
-        while True:
-            chunk = list(islice(command_iterator, column_count))
-            if not chunk:
-                break
-            self.log.print("".join(f"{command_name:<{column_width}}" for command_name in chunk),
-                           color=self.overlay.SECONDARY_TEXT_COLOR, mirror_to_stdout=True)
-
-    def help_autocomplete(self, text: str) -> tuple[int, list["Autocomplete.Option"]]:
-        return 0, list(Autocomplete.Option(command, str(func.__doc__ or "")) for command, func in self.get_all_commands().items() if command.startswith(text) and command != text)
-
-    @console_command(autocomplete_function=help_autocomplete)
-    def help(self, command_name: str = None) -> None:
-        """¯\\_(ツ)_/¯"""
-        if not command_name:
-            self.list_all_commands()
-        elif (command := self.get_all_commands().get(command_name)) is not None:
-            if command.__doc__:
-                self.log.print(command.__doc__.strip(), mirror_to_stdout=True)
-            self.print_usage_string(command)
-        else:
-            self.log.print(
-                f"The command {command_name} could not be found.",
-                color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-        return
-
-    @console_command
-    def clear(self) -> None:
-        """Clears the dev console"""
-        self.log.history.clear()
-        self.log.history_index = 0
-        self.log.render()
-
-    def eval_exec_autocomplete(self, text: str) -> tuple[int, list["Autocomplete.Option"]]:
-        def get_callable_args(callable_attr):
-            if not callable(callable_attr):
-                return None
-
-            try:
-                sig = inspect.signature(callable_attr)
-                formatted_params = []
-
-                for name, param in sig.parameters.items():
-                    if param.default is inspect.Parameter.empty:
-                        formatted_params.append(f"{name}")
-                    else:
-                        formatted_params.append(f"{name}={param.default!r}")
-
-                return f"({', '.join(formatted_params)})"
-            except (ValueError, TypeError):
-                # Handle case where signature can't be retrieved
-                return None
-
-        names = text.split(".")
-
-        current = self.overlay.namespace
-        for i, name in enumerate(names):
-            attr = getattr(current, name, None)
-            if i < len(names) - 1:
-                current = attr
-            else:
-                position = sum(len(name) for name in names[0:i]) + i
-                if hasattr(current, name):
-                    position = sum(len(name) for name in names) + i
-                    if inspect.ismethod(attr):
-                        return position, [Autocomplete.Option(get_callable_args(attr), "")]
-
-                options = []
-                for current_name in dir(current):
-                    if current_name.startswith("_") and not text.rsplit(".", 1)[-1].startswith("_"):
-                        continue
-                    if current_name.startswith("__") and not text.rsplit(".", 1)[-1].startswith("__"):
-                        continue
-                    if name.lower() not in current_name.lower() or current_name == name:
-                        continue
-                    obj = getattr(current, current_name)
-                    if (str(obj).startswith("<") or str(obj).endswith(">")) and not callable(obj) or isinstance(obj, types.SimpleNamespace):
-                        current_name += "."
-                    if len(str(obj)) <= max(Autocomplete.MAX_UNSHORTENED_HINT_LENGTH, len(type(obj).__name__)):
-                        hint: str = str(obj)
-                        cursive = False
-                    else:
-                        hint: str = type(obj).__name__
-                        cursive = True
-                    options.append(Autocomplete.Option(current_name, hint, cursive))
-                return position, options
-        return None
-
-    @console_command(is_cheat_protected=True, show_return_value=True, autocomplete_function=eval_exec_autocomplete)
-    def eval(self, eval_string: str):
-        """Evaluate an arbitrary string"""
-        try:
-            return_value = eval(eval_string, None, self.overlay.namespace.__dict__)
-            self.overlay.namespace.__dict__["_"] = return_value
-            return return_value
-        except Exception as e:
-            self.print_exception_to_log(e)
-
-    @console_command(is_cheat_protected=True, show_return_value=False, autocomplete_function=eval_exec_autocomplete)
-    def exec(self, exec_string: str):
-        """Execute an arbitrary string"""
-        try:
-            exec(exec_string, None, self.overlay.namespace.__dict__)
-        except Exception as e:
-            self.print_exception_to_log(e)
-
-    def bind_autocomplete(self, text: str) -> tuple[int, list["Autocomplete.Option"]]:
-        parts = text.split()
-        space = text.endswith(" ")
-
-        if not parts:
-            return 0, [Autocomplete.Option(k + " ", "") for k in self.KEY_MAPPING]
-
-        if len(parts) == 1 and not space:
-            return 0, [Autocomplete.Option(k + " ", "") for k in self.KEY_MAPPING if k.startswith(parts[0])]
-
-        pos = len(parts[0]) + 1
-        prefix = parts[-1] if not space else ""
-
-        options = [Autocomplete.Option(c, "") for c in self.get_all_commands() if c.startswith(prefix) and c != prefix]
-        return pos, options
-
-    @staticmethod
-    def get_bound_commands_string(bound_commands: list[str]) -> str:
-        return "; ".join(['"' + command + '"' if " " in command else command for command in bound_commands])
-
-    @console_command("bind", autocomplete_function=bind_autocomplete)
-    def bind_command(self, key: str, command: str = None) -> None:
-        """Binds a command to a key. Allows binding multiple commands to one key."""
-        key_constant: int | None = self.KEY_MAPPING.get(key)
-        if key_constant is None:
-            self.log.print(f"{key} is an invalid key", color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-            return
-
-        if command is None:
-            bound_commands: list[str] = self.keybinds.get(key_constant, [])
-            if not bound_commands:
-                self.log.print(f"No commands bound to {key}", mirror_to_stdout=True)
-            else:
-                self.log.print(f"bind {key} {self.get_bound_commands_string(bound_commands)}", mirror_to_stdout=True)
-            return
-
-        self.keybinds[key_constant].append(command)
-
-    def unbind_autocomplete(self, text: str) -> tuple[int, list["Autocomplete.Option"]]:
-        return 0, [Autocomplete.Option(self.INVERT_KEY_MAPPING[key], self.get_bound_commands_string(commands)) for key, commands in self.keybinds.items() if self.INVERT_KEY_MAPPING[key].startswith(text)]
-
-    @console_command("unbind", autocomplete_function=unbind_autocomplete)
-    def unbind_command(self, key: str):
-        """Unbinds all bound commands from the given key."""
-        key_constant: int | None = self.KEY_MAPPING.get(key)
-        if key_constant is None:
-            self.log.print(f"{key} is an invalid key", color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-            return
-
-        if not self.keybinds.get(key_constant):
-            return
-
-        self.keybinds.pop(key_constant)
+    @console_command("profiler")
+    def open_profiler_window(self):
+        """Open the window showing the timings of all profiling zones"""
+        self.overlay.children.append(ProfilerWindow(self.overlay, self.overlay, pg.Rect((200, 200), ProfilerWindow.SIZE)))
 
     @console_command("toggleconsole")
     def toggle_dev_console(self):
         """Toggles the developer console"""
         self.overlay.open = not self.overlay.open
 
-    @console_command
-    def restart(self):
-        """Attempts to restart the script with the same parameters as before"""
-        os.execv(sys.executable, [sys.executable] + sys.argv)
-
-    def handle_command(self, user_input: str, *, suppress_logging: bool = False, ignore_cheat_protection: bool = False):
-        if not user_input or user_input.isspace():
-            return
-
-        if not suppress_logging:
-            self.log.print(">>> " + user_input, color=self.overlay.PRIMARY_TEXT_COLOR, mirror_to_stdout=True)
-
-        command_name, *args = shlex.split(user_input)
-
-        func = self.get_all_commands().get(command_name)
-        if func is None:
-            self.log.print(f"No command {command_name} exists in the current game.", color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-            return
-        if getattr(func, "_is_cheat_protected", False) and not self.overlay.cheats_enabled and not ignore_cheat_protection:
-            self.log.print(f"The command {command_name} is cheat protected.", color=self.overlay.HIGHLIGHT_COLOR, mirror_to_stdout=True)
-            return
-
-        try:
-            cast_args = []
-            for arg, (param_name, param) in zip(args, inspect.signature(func).parameters.items()):
-                param_type = get_type_hints(func).get(param_name, "undef")
-                if param_type == "undef":
-                    cast_args.append(arg)
-                elif type(param_type) is types.UnionType:
-                    cast_arg = arg
-                    for unioned_type in sorted(param_type.__args__, key=lambda t: t is str):
-                        try:
-                            cast_arg = unioned_type(arg)
-                        except ValueError:
-                            continue
-                        break
-                    cast_args.append(cast_arg)
-                else:
-                    try:
-                        cast_args.append(param_type(arg))
-                    except ValueError as e:
-                        self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-            return_value = func(*cast_args)
-            if getattr(func, "_show_return_value", False):
-                self.log.print(str(return_value), mirror_to_stdout=True)
-        except TypeError as e:
-            self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.overlay.ERROR_COLOR, mirror_to_stdout=True)
-            self.print_usage_string(func)
-            return
-
-    def print_usage_string(self, func: Callable[..., Any]):
-        aliases = getattr(func, "_aliases", None)
-        string = f"Usage: {'/'.join(aliases)} " if aliases else f"Usage: {func.__name__} "
-        for param_name, param in inspect.signature(func).parameters.items():
-            param_type = get_type_hints(func).get(param_name, "undef")
-
-            if param_type == "undef":
-                param_type_name = "undef"
-            elif hasattr(param_type, "__name__"):
-                param_type_name = param_type.__name__
-            else:
-                param_type_name = str(param_type).replace(" ", "")
-
-            param_default = param.default if param.default is not inspect.Parameter.empty else None
-            if type(param_default) is str:
-                param_default = "'" + param_default + "'"
-            string += f"<{param_type_name} {param_name}{'=' + str(param_default) if param_default else ''}> "
-        return_type = get_type_hints(func).get('return', "undef")
-        return_type_name = return_type.__name__ if return_type != "undef" else "undef"
-        string += f"-> {return_type_name}" if return_type_name != "NoneType" else ""
-        self.log.print(string, mirror_to_stdout=True)
-
     def resize(self, size: tuple[int, int]):
         # This is janky af
         old_height = self.surface.get_height()
@@ -504,7 +201,10 @@ class DeveloperConsole(BaseElement):
         self.rect.h = new_height
         for child in self.children:
             child.rect.move_ip(0, diff)
+        self.invalidate_hit_index()
+        self.parent.invalidate_hit_index()
         self.surface = pg.Surface((self.surface.get_width(), new_height))
+        self.mark_dirty()
 
     def handle_event(self, event: pg.event.Event) -> bool:
         if event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
@@ -514,9 +214,9 @@ class DeveloperConsole(BaseElement):
         elif event.type == pg.KEYDOWN and (event.key == 1073741915 or event.key == pg.K_PAGEDOWN):
             self.resize((self.surface.get_width(), self.surface.get_height() + 50))
         elif event.type == pg.MOUSEWHEEL:
-            self.log.history_index -= event.y
-            self.log.history_index = max(0, min(self.log.history_index, len(self.log.history)-1))
-            self.log.render()
+            self.log_view.history_index -= event.y
+            self.log_view.history_index = max(0, min(self.log_view.history_index, len(self.log.history)-1))
+            self.log_view.render()
         else:
             return False
         return True
@@ -525,36 +225,69 @@ class DeveloperConsole(BaseElement):
         self.surface.fill(self.overlay.PRIMARY_COLOR)
 
         visible_log_height = self.surface.get_height() - self.input_box.surface.get_height() - 3 * self.overlay.border_offset
-        self.surface.blit(self.log.surface, (self.overlay.border_offset, self.overlay.border_offset),
-                          (0, self.log.surface.get_height() - visible_log_height, self.log.surface.get_width(), visible_log_height))
+        self.surface.blit(self.log_view.surface, (self.overlay.border_offset, self.overlay.border_offset),
+                          (0, self.log_view.surface.get_height() - visible_log_height, self.log_view.surface.get_width(), visible_log_height))
 
         if visible_log_height > 0:
-            self.draw_border_rect(self.surface, pg.Rect(self.overlay.border_offset, self.overlay.border_offset, self.log.surface.get_width(), visible_log_height), inset=True)
+            self.draw_border_rect(self.surface, pg.Rect(self.overlay.border_offset, self.overlay.border_offset, self.log_view.surface.get_width(), visible_log_height), inset=True)
         self.render_border()
 
 
 class Log(BaseElement):
-    def __init__(self, overlay: "DeveloperOverlay", parent: "BaseElement", rect: pg.Rect):
+    def __init__(self, overlay: "DeveloperOverlay", parent: "BaseElement", rect: pg.Rect, *,
+                 log_history: LogHistory | None = None):
         super().__init__(overlay, parent, rect)
-        self.surface.fill(overlay.SECONDARY_COLOR)
+        self.log_history: LogHistory = log_history or LogHistory()
+        self.log_history.view = self
+        self.history_index: int = len(self.log_history.history) - 1 if self.log_history.history else 0  # Index of the bottom-most visible line
+        self.render()
+
+    @property
+    def history(self) -> deque[tuple[str, tuple[int, int, int] | None]]:
+        return self.log_history.history
+
+    @property
+    def listeners(self) -> list[Callable[[str], None]]:
+        return self.log_history.listeners
+
+    def set_max_history_length(self, max_history_length: int) -> None:
+        self.log_history.set_max_history_length(max_history_length)
 
-        self.history: list[tuple[str, tuple[int, int, int]]] = []
-        self.history_index: int = 0
+    def is_scrolled_to_bottom(self) -> bool:
+        return self.history_index >= len(self.history) - 1
+
+    def render_line(self, string: str, color: tuple[int, int, int] | None) -> pg.Surface:
+        color = color if color is not None else self.overlay.SECONDARY_TEXT_COLOR
+        return text_cache.render(self.overlay.font, string, True, color, self.overlay.SECONDARY_COLOR)
 
     def render(self):
+        """Redraws only the lines that fit on the log surface, ending with the line at history_index."""
         self.surface.fill(self.overlay.SECONDARY_COLOR)
-        for line, color in reversed(self.history[self.history_index::-1]):
-            self.print(line, color, mirror_to_stdout=False, append_to_history=False)
+        y = self.surface.get_height()
+        index = min(self.history_index, len(self.history) - 1)
+        while y > 0 and index >= 0:
+            font_surface = self.render_line(*self.history[index])
+            y -= font_surface.get_height()
+            self.surface.blit(font_surface, (0, y))
+            index -= 1
+        self.mark_dirty()
 
     def print(self, string: str, color: tuple[int, int, int] | None = None, *, mirror_to_stdout: bool = False, append_to_history: bool = True):
-        if append_to_history:
-            self.history.append((string, color))
-            self.history_index = len(self.history)
-        if mirror_to_stdout:
-            print("DEV: " + string, file=sys.__stdout__)
-        color = color if color is not None else self.overlay.SECONDARY_TEXT_COLOR
-        font_surface = self.overlay.font.render(string, True, color, self.overlay.SECONDARY_COLOR)
+        self.log_history.print(string, color, mirror_to_stdout=mirror_to_stdout, append_to_history=append_to_history)
+
+    def print_lines(self, strings: Iterable[str], color: tuple[int, int, int] | None = None, *, mirror_to_stdout: bool = False):
+        self.log_history.print_lines(strings, color, mirror_to_stdout=mirror_to_stdout)
+
+    def add_line(self, string: str, color: tuple[int, int, int] | None, was_scrolled_to_bottom: bool, appended: bool) -> None:
+        """Called by the history after a line was printed. Scrolls the surface by one line instead of redrawing it."""
+        if appended:
+            self.history_index = len(self.history) - 1
+        if not was_scrolled_to_bottom:
+            self.render()
+            return
+        font_surface = self.render_line(string, color)
         dy = -font_surface.get_height()
         self.surface.scroll(0, dy)
         self.surface.fill(self.overlay.SECONDARY_COLOR, (0, self.surface.get_height() + dy, self.surface.get_width(), -dy))
         self.surface.blit(font_surface, (0, self.surface.get_height() - font_surface.get_height()))
+        self.mark_dirty()
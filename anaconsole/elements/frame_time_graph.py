@@ -0,0 +1,37 @@
+import pygame as pg
+from anaconsole.lazy import get_numpy
+from .base_element import BaseElement
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    import numpy
+    from anaconsole.dev_overlay import DeveloperOverlay
+    from anaconsole.frame_stats import FrameTimeStats
+
+
+class FrameTimeGraph(BaseElement):
+    SIZE: tuple[int, int] = (240, 60)
+    LINE_COLOR: tuple[int, int, int] = (0, 255, 0)
+    BUDGET_LINE_COLOR: tuple[int, int, int] = (255, 255, 0)
+
+    def __init__(self, overlay: "DeveloperOverlay", position: tuple[int, int], stats: "FrameTimeStats"):
+        super().__init__(overlay, overlay, pg.Rect(position, self.SIZE))
+        self.stats: "FrameTimeStats" = stats
+
+    def render(self):
+        np = get_numpy()
+        self.render_body()
+        frame_times: "numpy.ndarray" = self.stats.get_frame_times()
+        width, height = self.rect.w - 2, self.rect.h - 2
+
+        # Scale so the budget sits at half height, but never cut off the largest frame time
+        scale_ms: float = max(2 * self.stats.budget_ms if self.stats.budget_ms is not None else 0.0,
+                              float(frame_times.max()) if len(frame_times) else 0.0, 1.0)
+        if self.stats.budget_ms is not None:
+            budget_y = 1 + height - int(self.stats.budget_ms / scale_ms * height)
+            pg.draw.line(self.surface, self.BUDGET_LINE_COLOR, (1, budget_y), (width, budget_y), 1)
+
+        if len(frame_times) >= 2:
+            xs = 1 + np.arange(len(frame_times)) * (width / max(1, self.stats.capacity - 1))
+            ys = 1 + height - frame_times / scale_ms * height
+            pg.draw.lines(self.surface, self.LINE_COLOR, False, np.column_stack((xs, ys)).tolist(), 1)
+        self.render_border(inset=True)
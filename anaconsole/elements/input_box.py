@@ -1,7 +1,7 @@
 import pygame as pg
-import pyperclip
+from anaconsole.text_cache import text_cache
 from .base_element import BaseElement
-from typing import Callable, TYPE_CHECKING, Literal
+from typing import Callable, TYPE_CHECKING, Literal, Any
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
     from .autocomplete import Autocomplete
@@ -54,7 +54,9 @@ class InputBox(BaseElement):
         abs_rect = self.get_absolute_rect()
         self.overlay.autocomplete.rect.topleft = (abs_rect.left, abs_rect.bottom)
         self.overlay.autocomplete.input_box = self
-        self.overlay.autocomplete.position, self.overlay.autocomplete.options = self.autocomplete_function(text)
+        position, options = self.autocomplete_function(text)
+        self.overlay.autocomplete.position = position
+        self.overlay.autocomplete.options = options[:self.overlay.autocomplete.MAX_OPTIONS]
         self.overlay.autocomplete.show = True if self.overlay.autocomplete.options else False
 
     def handle_event(self, event: pg.event.Event):
@@ -126,14 +128,17 @@ class InputBox(BaseElement):
                 self.select_all()
             elif event.key == pg.K_c and event.mod & pg.KMOD_CTRL:
                 if self.selection_range and self.selection_range[0] != self.selection_range[1]:
+                    import pyperclip
                     pyperclip.copy(self.text[min(self.selection_range):max(self.selection_range)])
             elif event.key == pg.K_x and event.mod & pg.KMOD_CTRL:
                 self.in_history = False
                 if self.selection_range and self.selection_range[0] != self.selection_range[1]:
+                    import pyperclip
                     pyperclip.copy(self.text[min(self.selection_range):max(self.selection_range)])
                     self.erase_selection_range()
             elif event.key == pg.K_v and event.mod & pg.KMOD_CTRL:
                 self.in_history = False
+                import pyperclip
                 if clipboard := pyperclip.paste():
                     if self.selection_range:
                         self.erase_selection_range()
@@ -223,7 +228,7 @@ class InputBox(BaseElement):
             color = self.overlay.PRIMARY_TEXT_COLOR
         else:
             color = self.overlay.SECONDARY_TEXT_COLOR
-        text_surface = self.overlay.font.render(text, True, color, None)
+        text_surface = text_cache.render(self.overlay.font, text, True, color, None)
         self.surface.blit(text_surface, (self.get_letter_x(0), (self.rect.h - text_surface.get_height()) // 2))
 
     def get_letter_x(self, letter_position: int) -> int:
@@ -251,6 +256,14 @@ class InputBox(BaseElement):
     def deselect(self) -> None:
         self.in_edit_mode = False
 
+    def get_render_state(self) -> Any:
+        return (super().get_render_state(),
+                self.text,
+                None if self.in_edit_mode else self.getter(),
+                self.in_edit_mode,
+                self.caret_position,
+                tuple(self.selection_range) if self.selection_range else None)
+
     def render_body(self):
         fill_color = self.overlay.PRIMARY_COLOR if not self.in_edit_mode else self.overlay.SECONDARY_COLOR
         self.surface.fill(fill_color)
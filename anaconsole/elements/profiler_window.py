@@ -0,0 +1,50 @@
+import pygame as pg
+from anaconsole.text_cache import text_cache
+from .base_element import BaseElement
+from .window import Window
+from typing import TYPE_CHECKING, Optional, Any
+if TYPE_CHECKING:
+    from anaconsole.dev_overlay import DeveloperOverlay
+
+
+class ProfilerView(BaseElement):
+    REFRESH_INTERVAL_FRAMES: int = 10
+    INDENT: int = 10
+
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), self.overlay.profiler.frame_count // self.REFRESH_INTERVAL_FRAMES
+
+    def render_body(self):
+        super().render_body()
+        font: pg.font.Font = self.overlay.font2
+        line_height: int = font.get_linesize()
+        mean_x, max_x = self.rect.w - 120, self.rect.w - 60
+        y = self.overlay.border_offset
+        for text, x in (("Zone", self.overlay.border_offset), ("Mean", mean_x), ("Max", max_x)):
+            self.surface.blit(text_cache.render(font, text, False, self.overlay.PRIMARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR), (x, y))
+        for path, mean_ms, max_ms in self.overlay.profiler.get_summary():
+            y += line_height
+            if y + line_height > self.rect.h:
+                break
+            *parents, name = path.split("/")
+            x = self.overlay.border_offset + len(parents) * self.INDENT
+            self.surface.blit(text_cache.render(font, name, False, self.overlay.SECONDARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR), (x, y))
+            self.surface.blit(font.render(f"{mean_ms:.2f}ms", False, self.overlay.SECONDARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR), (mean_x, y))
+            self.surface.blit(font.render(f"{max_ms:.2f}ms", False, self.overlay.SECONDARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR), (max_x, y))
+
+    def render(self):
+        self.render_body()
+        self.render_border(inset=True)
+
+
+class ProfilerWindow(Window):
+    SIZE: tuple[int, int] = (360, 300)
+
+    def __init__(self, overlay: "DeveloperOverlay", parent: Optional["BaseElement"], rect: pg.Rect):
+        super().__init__(overlay, parent, rect, title="Profiler")
+        self.children.append(ProfilerView(overlay, self, self.body_rect))
+        overlay.profiler.add_viewer()
+
+    def close(self):
+        self.overlay.profiler.remove_viewer()
+        super().close()
@@ -1,5 +1,5 @@
 import pygame as pg
-from typing import Type, Union, TYPE_CHECKING, Optional, Callable
+from typing import Type, Union, TYPE_CHECKING, Optional, Callable, Any
 from .base_element import BaseElement
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
@@ -79,6 +79,9 @@ class Slider(BaseElement):
             return True
         return False
 
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), self.getter()
+
     def render(self):
         self.surface.fill(self.TRANSPARENCY)
         self.set_handle_position(self.getter())
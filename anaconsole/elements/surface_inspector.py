@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 
 
 class SurfaceInspector(BaseElement):
+    ALWAYS_REDRAW: bool = True
     def __init__(self, overlay: "DeveloperOverlay", parent: BaseElement, rect: pg.Rect, inspect_surface: pg.Surface):
         super().__init__(overlay, parent, rect)
         self.inspect_surface: pg.Surface = inspect_surface
@@ -1,5 +1,6 @@
 import pygame as pg
-from anaconsole.assets import load_file_stream
+from anaconsole.asset_cache import asset_cache
+from anaconsole.text_cache import text_cache
 from .base_element import BaseElement
 from .checkbox import Checkbox
 from .button import Button
@@ -74,13 +75,17 @@ class Variable(BaseElement):
                 return
         return misc_var_setter
 
+    def get_render_state(self) -> Any:
+        val = self.getter()
+        return super().get_render_state(), str(round(val, 2) if isinstance(val, float) else val)
+
     def render(self):
         super().render()
-        name_surf = self.overlay.font2.render(self.name, False, self.overlay.PRIMARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR)
+        name_surf = text_cache.render(self.overlay.font2, self.name, False, self.overlay.PRIMARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR)
         val = self.getter()
         if isinstance(val, float):
             val = round(val, 2)
-        val_surf = self.overlay.font2.render(str(val), False, self.overlay.SECONDARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR)
+        val_surf = text_cache.render(self.overlay.font2, str(val), False, self.overlay.SECONDARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR)
         offset = self.rect.h//2 - name_surf.get_height() // 2
         self.surface.blit(name_surf, (2 * offset, offset))
         edit_element_width = self.children[0].rect.w if self.children else 0
@@ -91,7 +96,7 @@ class VariableMonitor(BaseElement):
     def __init__(self, overlay: "DeveloperOverlay", parent: Optional["BaseElement"], rect: pg.Rect):
         super().__init__(overlay, parent, rect)
         self.variable_height: int = int(overlay.char_height * 1.75) // 2 * 2
-        add_image: pg.Surface = pg.image.load(load_file_stream("add.png"))
+        add_image: pg.Surface = asset_cache.get_image("add.png").copy()
         add_image.fill(overlay.HIGHLIGHT_COLOR + (255,), special_flags=pg.BLEND_RGB_MULT)
         text_surf: pg.Surface = overlay.font2.render("Add variable", False, overlay.HIGHLIGHT_COLOR, overlay.PRIMARY_COLOR)
         button_surf: pg.Surface = pg.Surface(((add_image.get_width()+overlay.border_offset+text_surf.get_width()), max(add_image.get_height(), text_surf.get_height())))
@@ -119,6 +124,7 @@ class VariableMonitor(BaseElement):
                                       )
         self.new_var_button.children.append(var_name_input_box)
         self.new_var_button.selected_child = var_name_input_box
+        self.new_var_button.mark_dirty()
 
     def object_validator(self, text: str) -> bool:
         if any(char in text for char in ("(", ")")) or not "." in text:
@@ -135,10 +141,12 @@ class VariableMonitor(BaseElement):
         self.register_variable(obj, attr, attr)
         self.new_var_button.children.clear()
         self.new_var_button.locked = False
+        self.new_var_button.mark_dirty()
 
     def register_variable(self, obj: object, attr: str, name: str = None, **kwargs: dict[str:Any]):
         rect = pg.Rect(0, (len(self.children) - 1) * self.variable_height, self.rect.w, self.variable_height)
         self.new_var_button.rect.top += self.variable_height
+        self.invalidate_hit_index()
         var_name = name or attr
         var_type = get_type_hints(obj.__class__).get(attr) or type(getattr(obj, attr))
         if callable(getattr(obj, attr)):
@@ -148,6 +156,7 @@ class VariableMonitor(BaseElement):
             def setter(var): setattr(obj, attr, var)
             variable = Variable(self.overlay, self, rect, var_name, var_type, getter, setter, **kwargs)
         self.children.insert(-1, variable)
+        self.mark_dirty()
 
 
 class VariableMonitorWindow(Window):
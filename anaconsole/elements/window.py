@@ -1,15 +1,16 @@
 import pygame as pg
-from anaconsole.assets import load_file_stream
+from anaconsole.assets import lazy_image
+from anaconsole.text_cache import text_cache
 from .base_element import BaseElement
 from .button import Button
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Any
 if TYPE_CHECKING:
     from anaconsole.dev_overlay import DeveloperOverlay
 
 
 class Window(BaseElement):
-    CLOSE_BUTTON_IMAGE: pg.Surface = pg.image.load(load_file_stream("x.png"))
-    PIN_BUTTON_IMAGE: pg.Surface = pg.image.load(load_file_stream("pin.png"))
+    CLOSE_BUTTON_IMAGE: pg.Surface = lazy_image("x.png")
+    PIN_BUTTON_IMAGE: pg.Surface = lazy_image("pin.png")
     BUTTON_SIZE: int = 14
 
     def __init__(self, overlay: "DeveloperOverlay", parent: Optional["BaseElement"], rect: pg.Rect, title: str):
@@ -45,16 +46,21 @@ class Window(BaseElement):
         if self.is_selected(must_be_last_in_linked_list=False):
             self.parent.select_next()
         self.overlay.children.remove(self)
+        self.overlay.invalidate_hit_index()
         del self
 
+    def get_render_state(self) -> Any:
+        return super().get_render_state(), self.title
+
     def render_body(self):
         super().render_body()
-        title_surface = self.overlay.font.render(self.title, False, self.overlay.PRIMARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR)
+        title_surface = text_cache.render(self.overlay.font, self.title, False, self.overlay.PRIMARY_TEXT_COLOR, self.overlay.PRIMARY_COLOR)
         self.surface.blit(title_surface, (self.overlay.border_offset, self.overlay.border_offset))
 
     def handle_event(self, event: pg.event.Event) -> bool:
         if event.type == pg.MOUSEMOTION and pg.mouse.get_pressed()[0] and self.is_selected():
             self.rect.move_ip(event.rel)
+            self.parent.invalidate_hit_index()
             # self.rect.right = min(self.rect.right, self.parent.rect.right)  # TODO: clamp window position
             # ...
             return True
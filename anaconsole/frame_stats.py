@@ -0,0 +1,86 @@
+from time import perf_counter_ns
+from typing import TYPE_CHECKING
+from anaconsole.lazy import get_numpy
+if TYPE_CHECKING:
+    import numpy
+
+
+class FrameTimeStats:
+    """Ring buffer of frame times in milliseconds, measured with sub-millisecond resolution."""
+    PERCENTILES: tuple[float, ...] = (50.0, 95.0, 99.0, 99.9)
+    STUTTER_FACTOR: float = 1.25  # Frames taking longer than this many frame budgets count as stutters, so timer jitter does not
+    HITCH_FACTOR: float = 2.0  # Frames taking longer than this many frame budgets count as hitches
+
+    def __init__(self, capacity: int, target_framerate: float | None = None):
+        self._capacity: int = max(1, capacity)
+        self._frame_times_ms: "numpy.ndarray | None" = None  # Allocated by the first record(), so numpy is only imported when needed
+        self._index: int = 0
+        self._count: int = 0
+        self._last_timestamp_ns: int | None = None
+        self.budget_ms: float | None = 1000 / max(target_framerate, 1.0) if target_framerate is not None else None
+        self.total_frames: int = 0
+        self.total_stutters: int = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def tick(self) -> None:
+        """Records the time since the previous tick. Call once per frame."""
+        now: int = perf_counter_ns()
+        if self._last_timestamp_ns is not None:
+            self.record((now - self._last_timestamp_ns) / 1e6)
+        self._last_timestamp_ns = now
+
+    def record(self, frame_time_ms: float) -> None:
+        if self._frame_times_ms is None:
+            np = get_numpy()
+            self._frame_times_ms = np.zeros(self._capacity, dtype=np.float64)
+        self._frame_times_ms[self._index] = frame_time_ms
+        self._index = (self._index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.total_frames += 1
+        if self.budget_ms is not None and frame_time_ms > self.STUTTER_FACTOR * self.budget_ms:
+            self.total_stutters += 1
+
+    def reset(self) -> None:
+        """Clears all samples. The next tick only starts a new measurement."""
+        self._index = 0
+        self._count = 0
+        self._last_timestamp_ns = None
+        self.total_frames = 0
+        self.total_stutters = 0
+
+    def get_frame_times(self) -> "numpy.ndarray":
+        """Returns the buffered frame times in chronological order."""
+        np = get_numpy()
+        if self._frame_times_ms is None:
+            return np.zeros(0, dtype=np.float64)
+        if self._count < self.capacity:
+            return self._frame_times_ms[:self._count]
+        return np.concatenate((self._frame_times_ms[self._index:], self._frame_times_ms[:self._index]))
+
+    def get_mean(self) -> float:
+        return float(self._frame_times_ms[:self._count].mean()) if self._count else 0.0
+
+    def get_max(self) -> float:
+        return float(self._frame_times_ms[:self._count].max()) if self._count else 0.0
+
+    def get_percentiles(self) -> dict[float, float]:
+        if not self._count:
+            return {percentile: 0.0 for percentile in self.PERCENTILES}
+        np = get_numpy()
+        values = np.percentile(self._frame_times_ms[:self._count], self.PERCENTILES)
+        return {percentile: float(value) for percentile, value in zip(self.PERCENTILES, values)}
+
+    def count_over_budget(self, factor: float | None = None) -> int:
+        """Counts the buffered frames that took longer than factor times the frame budget, STUTTER_FACTOR by default."""
+        if self.budget_ms is None or not self._count:
+            return 0
+        if factor is None:
+            factor = self.STUTTER_FACTOR
+        np = get_numpy()
+        return int(np.count_nonzero(self._frame_times_ms[:self._count] > factor * self.budget_ms))
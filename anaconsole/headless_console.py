@@ -0,0 +1,794 @@
+import shlex
+import time
+import pygame as pg
+import pygame.locals
+import os
+import inspect
+from typing import TYPE_CHECKING, Callable, Any, Iterable
+from itertools import islice
+from functools import partial
+import types
+import sys
+from collections import deque, defaultdict
+from pathlib import Path
+import traceback
+import threading
+import queue
+from dataclasses import dataclass
+from anaconsole.prefix_index import PrefixIndex
+from anaconsole.lazy import LazyClassAttribute
+from anaconsole.command_plan import CommandPlan, get_command_plan
+from anaconsole.cfg_cache import CompiledConfigCache
+from anaconsole.code_cache import CodeCache
+from anaconsole.jobs import JobManager, Job
+from anaconsole.command_queue import CommandQueue
+if TYPE_CHECKING:
+    from anaconsole.elements.dev_console import Log
+    from anaconsole.remote_console import RemoteConsoleServer
+
+
+MAX_AUTOCOMPLETE_OPTIONS = 32
+MAX_UNSHORTENED_HINT_LENGTH = 16
+
+
+CommandCarrierType = Any  # Any namespace that contains console commands
+
+
+class OutputRedirector:
+    def __init__(self, *custom_redirects: Callable[[str], None]):
+        # Writes are passed on to the stdout this replaces, so several redirectors can be installed on top of each other
+        self.stdout = sys.stdout
+        self.custom_redirects: tuple[Callable[[str], None], ...] = custom_redirects
+        # Output of other threads is queued and only redirected once the owning thread calls flush_pending()
+        self.owner_thread_id: int = threading.get_ident()
+        self.pending: queue.SimpleQueue[str] = queue.SimpleQueue()
+
+    def write(self, text):
+        self.stdout.write(text)
+        if text.strip():  # Ignore empty lines
+            if threading.get_ident() != self.owner_thread_id:
+                self.pending.put(text)
+                return
+            for redirect in self.custom_redirects:
+                redirect(text)
+
+    def flush_pending(self):
+        while not self.pending.empty():
+            text = self.pending.get_nowait()
+            for redirect in self.custom_redirects:
+                redirect(text)
+
+    def flush(self):
+        self.stdout.flush()
+
+    def uninstall(self):
+        """
+        Stops redirecting. Restores the previous stdout if this redirector is still sys.stdout, otherwise it stays
+        in the chain below a later redirector and only passes writes on.
+        """
+        self.custom_redirects = ()
+        if sys.stdout is self:
+            stdout = self.stdout
+            while isinstance(stdout, OutputRedirector) and not stdout.custom_redirects:
+                stdout = stdout.stdout  # Uninstalled redirectors that were waiting below this one
+            sys.stdout = stdout
+
+
+def console_command(*aliases: str, is_cheat_protected: bool = False, show_return_value: bool = False, autocomplete_function: Callable[[str], tuple[int, list["AutocompleteOption"]]] | None = None, hint: Callable[[CommandCarrierType], Any] | None = None, background: bool = False, in_process: bool = False):
+    # This cursed if statement ensures that the decorator works even when used without parentheses
+    if len(aliases) == 1 and callable(aliases[0]) and not isinstance(aliases[0], str):
+        f = aliases[0]
+        f._is_console_command = True
+        return f
+
+    def decorator(func):
+        func._is_console_command = True
+        func._aliases = aliases
+        func._is_cheat_protected = is_cheat_protected
+        func._show_return_value = show_return_value
+        func._autocomplete_function = autocomplete_function
+        func._run_in_background = background or in_process
+        func._run_in_process = in_process
+        if hint: setattr(func, "_hint", hint)
+        return func
+    return decorator
+
+
+@dataclass(frozen=True)
+class AutocompleteOption:
+    name: str
+    type_hint: str
+    italics: bool = True
+
+
+class LogHistory:
+    """
+    Printed lines of the console, without any rendering. Every line is passed to the listeners as plain text,
+    the Log element of a DeveloperConsole shows the history once the console UI is built.
+    """
+    MAX_HISTORY_LENGTH: int = 5000
+
+    def __init__(self, max_history_length: int | None = None):
+        # Bounded ring buffer, the oldest lines are dropped once it is full
+        self.history: deque[tuple[str, tuple[int, int, int] | None]] = deque(maxlen=max_history_length or self.MAX_HISTORY_LENGTH)
+        self.listeners: list[Callable[[str], None]] = []  # Called with every printed line, e.g. by the remote console
+        self.view: "Log | None" = None  # Set by the Log element that shows this history
+        self.mirror_enabled: bool = True  # If False, lines printed with mirror_to_stdout are not written to stdout
+
+    def set_max_history_length(self, max_history_length: int) -> None:
+        self.history = deque(self.history, maxlen=max_history_length)
+        if self.view is not None:
+            self.view.history_index = max(0, min(self.view.history_index, len(self.history) - 1))
+            self.view.render()
+
+    def clear(self) -> None:
+        self.history.clear()
+        if self.view is not None:
+            self.view.history_index = 0
+            self.view.render()
+
+    def print(self, string: str, color: tuple[int, int, int] | None = None, *, mirror_to_stdout: bool = False, append_to_history: bool = True):
+        was_scrolled_to_bottom = self.view is not None and self.view.is_scrolled_to_bottom()
+        if append_to_history:
+            self.history.append((string, color))
+            for listener in self.listeners:
+                listener(string)
+        if mirror_to_stdout and self.mirror_enabled:
+            print("DEV: " + string, file=sys.__stdout__)
+        if self.view is not None:
+            self.view.add_line(string, color, was_scrolled_to_bottom, append_to_history)
+
+    def print_lines(self, strings: Iterable[str], color: tuple[int, int, int] | None = None, *, mirror_to_stdout: bool = False):
+        """Appends many lines at once, with a single layout pass instead of one scroll per line."""
+        lines = [(string, color) for string in strings]
+        if not lines:
+            return
+        self.history.extend(lines)
+        for listener in self.listeners:
+            for string, _ in lines:
+                listener(string)
+        if mirror_to_stdout and self.mirror_enabled:
+            sys.__stdout__.write("".join(f"DEV: {string}\n" for string, _ in lines))
+        if self.view is not None:
+            self.view.history_index = len(self.history) - 1
+            self.view.render()
+
+
+class HeadlessConsole:
+    """
+    The command engine of the developer console without any rendering: command parsing, the command registry,
+    keybinds, cfg files, eval/exec, background jobs and the log. Output goes to the output sinks as plain text.
+    Used on its own by dedicated servers and other headless programs, which have to call update() every tick.
+    """
+    DEFAULT_COLUMN_COUNT = 80  # Width of the command list
+    KEY_MAPPING: dict[str, int] = LazyClassAttribute(lambda cls: {name.removeprefix("K_"): getattr(pygame.locals, name) for name in dir(pg.locals) if name.startswith('K_')})
+    INVERT_KEY_MAPPING: dict[int, str] = LazyClassAttribute(lambda cls: {value: key for key, value in cls.KEY_MAPPING.items()})
+    KEY_INDEX: PrefixIndex = LazyClassAttribute(lambda cls: PrefixIndex(cls.KEY_MAPPING))
+    # Colors stored with the log lines, only shown by the DeveloperConsole
+    PRIMARY_TEXT_COLOR: tuple[int, int, int] = (255, 255, 255)
+    SECONDARY_TEXT_COLOR: tuple[int, int, int] = (216, 222, 211)
+    HIGHLIGHT_COLOR: tuple[int, int, int] = (150, 135, 50)
+    ERROR_COLOR: tuple[int, int, int] = (255, 64, 64)
+
+    def __init__(self,
+                 namespaces: dict[str, object] | None = None,
+                 *,
+                 enable_cheats: bool = False,
+                 output_sinks: Iterable[Callable[[str], None]] = (),
+                 mirror_to_stdout: bool = True,
+                 capture_stdout: bool = False,
+                 max_history_length: int | None = None,
+                 autoexec: Iterable[str] = (),
+                 cache_cfg_bytecode_on_disk: bool = False,
+                 ) -> None:
+        """
+        Every printed line is passed to the output sinks, e.g. logging.getLogger("console").info.
+        With mirror_to_stdout, lines are also written to stdout, prefixed with "DEV: ".
+        With capture_stdout, everything printed to sys.stdout is added to the log as well. Sinks must then
+        write to sys.__stdout__ instead of sys.stdout. Several consoles can capture stdout at once, each of them
+        logs all output. Call close() once the console is no longer needed.
+        """
+        self.namespace = types.SimpleNamespace(
+            dev_console=self,
+            main=sys.modules["__main__"],
+            **namespaces if namespaces else dict(),
+        )
+        self.cheats_enabled: bool = enable_cheats
+        self.keybinds: dict[str|int, list[str]] = defaultdict(list)
+        self._commands: dict[str, Callable[..., Any]] = dict()
+        self._registered_commands: dict[str, Callable[..., Any]] = dict()
+        self._unregistered_command_names: set[str] = set()
+        self._namespace_snapshot: tuple[Any, ...] | None = None
+        self._carrier_commands: dict[int, tuple[CommandCarrierType, dict[str, Callable[..., Any]]]] = dict()
+        self.command_registry_version: int = 0  # Incremented whenever the set of available commands changes
+        self._command_index: PrefixIndex = PrefixIndex()
+        self._keybind_index: PrefixIndex | None = None
+        # Key -> callables for key down and key up, prepared from the bound commands. Recompiled when binds,
+        # the registry or the cheat setting change
+        self._compiled_keybinds: dict[int, tuple[list[Callable[[], Any]], list[Callable[[], Any]]]] | None = None
+        self._compiled_keybinds_version: tuple[int, bool] | None = None
+        self._compiled_keybind_sources: dict[int, tuple[str, ...]] = dict()  # The commands each key was compiled from
+        self._held_keys: set[int] = set()  # Keys whose + commands ran and whose - commands are still due
+        self.cfg_cache: CompiledConfigCache = CompiledConfigCache(write_to_disk=cache_cfg_bytecode_on_disk)
+        self.code_cache: CodeCache = CodeCache()
+        self.jobs: JobManager = JobManager()
+        self.log: LogHistory = LogHistory(max_history_length)
+        self.log.mirror_enabled = mirror_to_stdout
+        self.log.listeners.extend(output_sinks)
+        self.command_queue: CommandQueue = CommandQueue(self)
+        self.remote_console: "RemoteConsoleServer | None" = None
+        self._output_redirector: OutputRedirector | None = None
+        if capture_stdout:
+            self._output_redirector = OutputRedirector(self.log.print)
+            sys.stdout = self._output_redirector
+        self.run_autoexec(autoexec)
+
+    def update(self) -> None:
+        """Collects output and results of background work and runs commands submitted by other threads. Call once per tick."""
+        if self._output_redirector is not None:
+            self._output_redirector.flush_pending()
+        self.poll_jobs()
+        self.command_queue.process()
+        if self.remote_console is not None:
+            self.remote_console.flush_output()
+
+    def close(self) -> None:
+        """Stops capturing stdout, cancels running jobs and stops the remote console. Safe to call more than once."""
+        if self._output_redirector is not None:
+            self._output_redirector.flush_pending()
+            self._output_redirector.uninstall()
+            self._output_redirector = None
+        self.jobs.shutdown()
+        if self.remote_console is not None:
+            self.remote_console.stop()
+            self.remote_console = None
+
+    def start_remote_console(self, host: str = "127.0.0.1", port: int | None = None, *,
+                             unix_socket_path: str | None = None) -> "RemoteConsoleServer":
+        """
+        Accepts commands over TCP, or over a unix socket if unix_socket_path is given. Connect with
+        `python -m anaconsole.remote_client`. Commands run on the main thread during update(), so headless games
+        have to call update() every tick. The port defaults to remote_console.DEFAULT_PORT.
+        Raises OSError if the address cannot be bound.
+        """
+        if self.remote_console is None:
+            from .remote_console import RemoteConsoleServer, DEFAULT_PORT
+            self.remote_console = RemoteConsoleServer(self, host, DEFAULT_PORT if port is None else port,
+                                                      unix_socket_path=unix_socket_path)
+            try:
+                self.remote_console.start()
+            except OSError:
+                self.remote_console = None
+                raise
+            self.log.print(f"Remote console listening on {self.remote_console.get_address_string()}",
+                           mirror_to_stdout=True)
+        return self.remote_console
+
+    def get_line_width(self) -> int:
+        """Number of characters that fit on a line of the output, used to lay out the command list."""
+        return self.DEFAULT_COLUMN_COUNT
+
+    def dev_console_autocomplete(self, text: str) -> tuple[int, list[AutocompleteOption]]:
+        if not text:
+            return 0, []
+        words = text.split(" ", maxsplit=1)
+        if len(words) == 1:
+            position, options = 0, []
+            all_commands = self.get_all_commands()
+            for command in self.get_command_index().find(text, MAX_AUTOCOMPLETE_OPTIONS, include_exact=False):
+                func = all_commands[command]
+                retrieved_value = None
+                if hint := getattr(func, "_hint", None):
+                    for command_carrier in self.namespace.__dict__.values():
+                        try:
+                            retrieved_value = hint(command_carrier)
+                            break
+                        except AttributeError:
+                            continue
+                options.append(AutocompleteOption(command + " ", str(retrieved_value) if retrieved_value is not None else "", False))
+            return position, options
+        else:
+            position = len(words[0]) + 1
+            command: Callable[[...], Any] | None = self.get_all_commands().get(words[0])
+            if not command:
+                return 0, []
+            autocomplete_function: Callable[[str], list[str]] | None = getattr(command, "_autocomplete_function", None)
+            if not autocomplete_function:
+                return 0, []
+
+            offset, options = 0, []
+            for command_carrier in self.namespace.__dict__.values():
+                if getattr(command_carrier, autocomplete_function.__name__, None):
+                    offset, options = getattr(command_carrier, autocomplete_function.__name__)(words[1])
+                    break
+            position += offset
+            return position, options
+
+    def print_exception_to_log(self, e: BaseException) -> None:
+        self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.ERROR_COLOR,
+                       mirror_to_stdout=True)
+        self.log.print_lines("".join(traceback.format_exception(e)).split("\n"), color=self.ERROR_COLOR, mirror_to_stdout=True)
+
+    @staticmethod
+    def exec_cfg_autocomplete(text: str) -> tuple[int, list[AutocompleteOption]]:
+        userpath: list[str] = text.split("/")
+        position = text.rfind("/") + 1 if text.rfind("/") != -1 else 0
+        path = Path.cwd() / Path(*userpath)
+        if not path.exists():
+            path = Path.cwd() / Path(*userpath[:-1])
+        if not path.exists():
+            return 0, []
+        if not path.is_dir():
+            return 0, []
+        names = [f.name + '/' if f.is_dir() else f.name for f in path.iterdir() if f.name.startswith(userpath[-1])]
+        if "../".startswith(userpath[-1]): names.append("../")
+        return position, [AutocompleteOption(name, "") for name in names]
+
+    @console_command("code_cache_stats")
+    def print_code_cache_stats(self):
+        """Prints hit, miss and eviction statistics of the eval/exec code cache"""
+        self.log.print(self.code_cache.get_stats_string(), mirror_to_stdout=True)
+
+    @console_command(autocomplete_function=exec_cfg_autocomplete, is_cheat_protected=True)
+    def exec_cfg(self, filepath: str) -> None:
+        """Executes any file containing python code"""
+        path = Path.cwd() / filepath
+        if not path.exists():
+            self.log.print(f"Config {filepath} does not exist.", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            return
+        try:
+            exec(self.cfg_cache.get_code(path), None, self.namespace.__dict__)
+        except Exception as e:
+            self.print_exception_to_log(e)
+
+    def run_autoexec(self, filepaths: Iterable[str]) -> None:
+        """Executes the given cfg files in order and logs how long each of them took."""
+        for filepath in filepaths:
+            start_time_ns: int = time.perf_counter_ns()
+            self.exec_cfg(filepath)
+            self.log.print(f"autoexec {filepath}: {(time.perf_counter_ns() - start_time_ns) / 1e6:.2f}ms",
+                           color=self.SECONDARY_TEXT_COLOR, mirror_to_stdout=True)
+
+    @console_command(show_return_value=True)
+    def get_cwd(self) -> str:
+        """Gives the path of the current working directory"""
+        return os.getcwd()
+
+    @console_command("change_cwd", "chdir", show_return_value=False, is_cheat_protected=True)
+    def change_cwd(self, path: str) -> None:
+        """Changes the CWD, relative paths only."""
+        os.chdir(os.path.join(os.getcwd(), path))
+
+    @staticmethod
+    def find_commands(instance: CommandCarrierType) -> dict[str: Callable[..., Any]]:
+        commands: dict[str: Callable[..., Any]] = dict()
+        if isinstance(instance, types.ModuleType):
+            # getmembers() and isinstance() would load the lazily loaded submodules of modules like pygame, importing numpy
+            members = [(name, value) for name, value in vars(instance).items() if type(value) is types.MethodType]
+        else:
+            members = inspect.getmembers(instance, predicate=inspect.ismethod)
+        for name, method in members:
+            if not getattr(method, "_is_console_command", False):
+                continue
+            aliases = getattr(method, "_aliases", False)
+            if aliases is not False and len(aliases) > 0:
+                for alias in aliases:
+                    commands[alias] = method
+            else:
+                commands[name] = method
+        return commands
+
+    def get_all_commands(self) -> dict[str: Callable[..., Any]]:
+        """Returns the command registry, which is only rebuilt if the namespace changed since the last call."""
+        # The snapshot keeps references to the namespace values alive, so their ids cannot be reused
+        namespace_values = tuple(self.namespace.__dict__.values())
+        if (self._namespace_snapshot is None
+                or len(namespace_values) != len(self._namespace_snapshot)
+                or any(a is not b for a, b in zip(namespace_values, self._namespace_snapshot))):
+            self._namespace_snapshot = namespace_values
+            self.rebuild_command_registry()
+        return self._commands
+
+    def get_command_index(self) -> PrefixIndex:
+        self.get_all_commands()  # Rebuilds the index along with the registry if the namespace changed
+        return self._command_index
+
+    def rebuild_command_registry(self) -> None:
+        # Carriers that were already inspected during the last rebuild are not inspected again
+        carrier_commands: dict[int, tuple[CommandCarrierType, dict[str, Callable[..., Any]]]] = dict()
+        all_commands: dict[str: Callable[..., Any]] = dict()
+        for command_carrier in self._namespace_snapshot or ():
+            cached = self._carrier_commands.get(id(command_carrier))
+            if cached is None or cached[0] is not command_carrier:
+                cached = (command_carrier, self.find_commands(command_carrier))
+            carrier_commands[id(command_carrier)] = cached
+            all_commands.update(cached[1])
+        self._carrier_commands = carrier_commands
+        all_commands.update(self._registered_commands)
+        for command_name in self._unregistered_command_names:
+            all_commands.pop(command_name, None)
+        self._commands = all_commands
+        self._command_index = PrefixIndex(all_commands)
+        self.command_registry_version += 1
+
+    def invalidate_command_registry(self, *, rescan: bool = False) -> None:
+        """
+        Forces the registry to be rebuilt on the next lookup.
+        Pass rescan=True if console commands were added to an object that is already in the namespace.
+        """
+        self._namespace_snapshot = None
+        if rescan:
+            self._carrier_commands.clear()
+
+    def register_command(self, func: Callable[..., Any], *names: str) -> None:
+        """Registers a callable as a console command under the given names, its aliases or its own name."""
+        names = names or getattr(func, "_aliases", None) or (func.__name__,)
+        for name in names:
+            self._registered_commands[name] = func
+            self._unregistered_command_names.discard(name)
+        self.invalidate_command_registry()
+
+    def unregister_command(self, name: str) -> None:
+        """Removes a command from the registry, including commands found in the namespace."""
+        self._registered_commands.pop(name, None)
+        self._unregistered_command_names.add(name)
+        self.invalidate_command_registry()
+
+    def list_all_commands(self):
+        all_commands = self.get_all_commands().keys()
+        if not all_commands:
+            self.log.print("No console commands found.", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            return
+        self.log.print("List of all available commands: (type help <command> for help)", mirror_to_stdout=True)
+        column_gap = 2
+        column_width = max(len(command_name) for command_name in all_commands) + column_gap
+        column_count = max(1, self.get_line_width() // column_width)
+        command_iterator = iter(all_commands)
+        lines: list[str] = []
+        while True:
+            chunk = list(islice(command_iterator, column_count))
+            if not chunk:
+                break
+            lines.append("".join(f"{command_name:<{column_width}}" for command_name in chunk))
+        self.log.print_lines(lines, color=self.SECONDARY_TEXT_COLOR, mirror_to_stdout=True)
+
+    def help_autocomplete(self, text: str) -> tuple[int, list[AutocompleteOption]]:
+        all_commands = self.get_all_commands()
+        return 0, [AutocompleteOption(command, str(all_commands[command].__doc__ or ""))
+                   for command in self.get_command_index().find(text, MAX_AUTOCOMPLETE_OPTIONS, include_exact=False)]
+
+    @console_command(autocomplete_function=help_autocomplete)
+    def help(self, command_name: str = None) -> None:
+        """¯\\_(ツ)_/¯"""
+        if not command_name:
+            self.list_all_commands()
+        elif (command := self.get_all_commands().get(command_name)) is not None:
+            if command.__doc__:
+                self.log.print(command.__doc__.strip(), mirror_to_stdout=True)
+            self.print_usage_string(command)
+        else:
+            self.log.print(
+                f"The command {command_name} could not be found.",
+                color=self.ERROR_COLOR, mirror_to_stdout=True)
+        return
+
+    @console_command
+    def clear(self) -> None:
+        """Clears the dev console"""
+        self.log.clear()
+
+    def eval_exec_autocomplete(self, text: str) -> tuple[int, list[AutocompleteOption]]:
+        def get_callable_args(callable_attr):
+            if not callable(callable_attr):
+                return None
+
+            try:
+                sig = inspect.signature(callable_attr)
+                formatted_params = []
+
+                for name, param in sig.parameters.items():
+                    if param.default is inspect.Parameter.empty:
+                        formatted_params.append(f"{name}")
+                    else:
+                        formatted_params.append(f"{name}={param.default!r}")
+
+                return f"({', '.join(formatted_params)})"
+            except (ValueError, TypeError):
+                # Handle case where signature can't be retrieved
+                return None
+
+        names = text.split(".")
+
+        current = self.namespace
+        for i, name in enumerate(names):
+            attr = getattr(current, name, None)
+            if i < len(names) - 1:
+                current = attr
+            else:
+                position = sum(len(name) for name in names[0:i]) + i
+                if hasattr(current, name):
+                    position = sum(len(name) for name in names) + i
+                    if inspect.ismethod(attr):
+                        return position, [AutocompleteOption(get_callable_args(attr), "")]
+
+                options = []
+                for current_name in dir(current):
+                    if current_name.startswith("_") and not text.rsplit(".", 1)[-1].startswith("_"):
+                        continue
+                    if current_name.startswith("__") and not text.rsplit(".", 1)[-1].startswith("__"):
+                        continue
+                    if name.lower() not in current_name.lower() or current_name == name:
+                        continue
+                    obj = getattr(current, current_name)
+                    if (str(obj).startswith("<") or str(obj).endswith(">")) and not callable(obj) or isinstance(obj, types.SimpleNamespace):
+                        current_name += "."
+                    if len(str(obj)) <= max(MAX_UNSHORTENED_HINT_LENGTH, len(type(obj).__name__)):
+                        hint: str = str(obj)
+                        cursive = False
+                    else:
+                        hint: str = type(obj).__name__
+                        cursive = True
+                    options.append(AutocompleteOption(current_name, hint, cursive))
+                return position, options
+        return None
+
+    @console_command(is_cheat_protected=True, show_return_value=True, autocomplete_function=eval_exec_autocomplete)
+    def eval(self, eval_string: str):
+        """Evaluate an arbitrary string"""
+        try:
+            return_value = eval(self.code_cache.compile(eval_string, "eval"), None, self.namespace.__dict__)
+            self.namespace.__dict__["_"] = return_value
+            return return_value
+        except Exception as e:
+            self.print_exception_to_log(e)
+
+    @console_command(is_cheat_protected=True, show_return_value=False, autocomplete_function=eval_exec_autocomplete)
+    def exec(self, exec_string: str):
+        """Execute an arbitrary string"""
+        try:
+            exec(self.code_cache.compile(exec_string, "exec"), None, self.namespace.__dict__)
+        except Exception as e:
+            self.print_exception_to_log(e)
+
+    def bind_autocomplete(self, text: str) -> tuple[int, list[AutocompleteOption]]:
+        parts = text.split()
+        space = text.endswith(" ")
+
+        if not parts:
+            return 0, [AutocompleteOption(k + " ", "") for k in self.KEY_INDEX.find("", MAX_AUTOCOMPLETE_OPTIONS)]
+
+        if len(parts) == 1 and not space:
+            return 0, [AutocompleteOption(k + " ", "") for k in self.KEY_INDEX.find(parts[0], MAX_AUTOCOMPLETE_OPTIONS)]
+
+        pos = len(parts[0]) + 1
+        prefix = parts[-1] if not space else ""
+
+        options = [AutocompleteOption(c, "") for c in self.get_command_index().find(prefix, MAX_AUTOCOMPLETE_OPTIONS, include_exact=False)]
+        return pos, options
+
+    @staticmethod
+    def get_bound_commands_string(bound_commands: list[str]) -> str:
+        return "; ".join(['"' + command + '"' if " " in command else command for command in bound_commands])
+
+    @console_command("bind", autocomplete_function=bind_autocomplete)
+    def bind_command(self, key: str, command: str = None) -> None:
+        """Binds a command to a key. Allows binding multiple commands to one key. Keys bound to +command run -command on release."""
+        key_constant: int | None = self.KEY_MAPPING.get(key)
+        if key_constant is None:
+            self.log.print(f"{key} is an invalid key", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            return
+
+        if command is None:
+            bound_commands: list[str] = self.keybinds.get(key_constant, [])
+            if not bound_commands:
+                self.log.print(f"No commands bound to {key}", mirror_to_stdout=True)
+            else:
+                self.log.print(f"bind {key} {self.get_bound_commands_string(bound_commands)}", mirror_to_stdout=True)
+            return
+
+        self.keybinds[key_constant].append(command)
+        self._keybind_index = None
+        self._compiled_keybinds = None
+
+    def unbind_autocomplete(self, text: str) -> tuple[int, list[AutocompleteOption]]:
+        if self._keybind_index is None:
+            self._keybind_index = PrefixIndex(self.INVERT_KEY_MAPPING[key] for key, commands in self.keybinds.items() if commands)
+        return 0, [AutocompleteOption(key, self.get_bound_commands_string(self.keybinds[self.KEY_MAPPING[key]]))
+                   for key in self._keybind_index.find(text, MAX_AUTOCOMPLETE_OPTIONS)]
+
+    @console_command("unbind", autocomplete_function=unbind_autocomplete)
+    def unbind_command(self, key: str):
+        """Unbinds all bound commands from the given key."""
+        key_constant: int | None = self.KEY_MAPPING.get(key)
+        if key_constant is None:
+            self.log.print(f"{key} is an invalid key", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            return
+
+        if not self.keybinds.get(key_constant):
+            return
+
+        self.keybinds.pop(key_constant)
+        self._keybind_index = None
+        self._compiled_keybinds = None
+
+    def compile_keybind(self, command: str) -> Callable[[], Any]:
+        """
+        Prepares a bound command, so a key press calls it with already converted arguments.
+        Commands that cannot be prepared, e.g. unknown, cheat protected, background or generator commands,
+        or commands with invalid arguments, are run through handle_command instead, which reports the problem.
+        """
+        fallback = partial(self.handle_command, command, suppress_logging=True)
+        try:
+            command_name, *args = shlex.split(command)
+        except ValueError:
+            return fallback
+        func = self.get_all_commands().get(command_name)
+        if (func is None
+                or getattr(func, "_run_in_background", False)
+                or inspect.isgeneratorfunction(func)
+                or (getattr(func, "_is_cheat_protected", False) and not self.cheats_enabled)):
+            return fallback
+        plan: CommandPlan = get_command_plan(func)
+        if len(args) < plan.required_count:
+            return fallback
+        try:
+            cast_args = plan.convert_args(args)
+        except ValueError:
+            return fallback
+        if getattr(func, "_show_return_value", False):
+            return partial(self.print_return_value, func, *cast_args)
+        return partial(func, *cast_args)
+
+    def print_return_value(self, func: Callable[..., Any], *args: Any) -> None:
+        """Calls a show_return_value command from a keybind and prints the result, like handle_command does."""
+        self.log.print(str(func(*args)), mirror_to_stdout=True)
+
+    def get_compiled_keybinds(self) -> dict[int, tuple[list[Callable[[], Any]], list[Callable[[], Any]]]]:
+        """
+        Returns the prepared callables of every bound key, for key down and key up.
+        Commands bound as +command also run -command with the same arguments when the key is released, if it exists.
+        """
+        all_commands = self.get_all_commands()
+        version = (self.command_registry_version, self.cheats_enabled)
+        if self._compiled_keybinds is not None and self._compiled_keybinds_version == version:
+            return self._compiled_keybinds
+        compiled_keybinds: dict[int, tuple[list[Callable[[], Any]], list[Callable[[], Any]]]] = dict()
+        self._compiled_keybind_sources = dict()
+        for key, commands in self.keybinds.items():
+            self._compiled_keybind_sources[key] = tuple(commands)
+            on_press: list[Callable[[], Any]] = [self.compile_keybind(command) for command in commands]
+            on_release: list[Callable[[], Any]] = []
+            for command in commands:
+                if command.startswith("+") and "-" + command[1:].split(maxsplit=1)[0] in all_commands:
+                    on_release.append(self.compile_keybind("-" + command[1:]))
+            if on_press:
+                compiled_keybinds[key] = (on_press, on_release)
+        self._compiled_keybinds = compiled_keybinds
+        self._compiled_keybinds_version = version
+        return compiled_keybinds
+
+    def get_compiled_keybind(self, key: int) -> tuple[list[Callable[[], Any]], list[Callable[[], Any]]] | None:
+        """
+        Returns the prepared callables of one key, or None if nothing is bound to it.
+        Direct edits of keybinds that bypass bind and unbind are picked up by comparing the key's commands with the ones it was compiled from.
+        """
+        compiled_keybinds = self.get_compiled_keybinds()
+        if tuple(self.keybinds.get(key, ())) != self._compiled_keybind_sources.get(key, ()):
+            self._compiled_keybinds = None
+            compiled_keybinds = self.get_compiled_keybinds()
+        return compiled_keybinds.get(key)
+
+    def press_keybind(self, key: int) -> None:
+        compiled = self.get_compiled_keybind(key)
+        if compiled is None:
+            return
+        on_press, on_release = compiled
+        if on_release:
+            self._held_keys.add(key)
+        self.run_keybind_callables(on_press)
+
+    def release_keybind(self, key: int) -> None:
+        if key not in self._held_keys:
+            return
+        self._held_keys.discard(key)
+        compiled = self.get_compiled_keybind(key)
+        if compiled is not None:
+            self.run_keybind_callables(compiled[1])
+
+    def run_keybind_callables(self, callables: list[Callable[[], Any]]) -> None:
+        for func in callables:
+            try:
+                func()
+            except TypeError as e:  # Like handle_command
+                self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.ERROR_COLOR, mirror_to_stdout=True)
+                if isinstance(func, partial):
+                    # Return value binds wrap the command, whose usage is the one to show
+                    self.print_usage_string(func.args[0] if func.func == self.print_return_value else func.func)
+
+    @console_command
+    def restart(self):
+        """Attempts to restart the script with the same parameters as before"""
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    def handle_command(self, user_input: str, *, suppress_logging: bool = False, ignore_cheat_protection: bool = False):
+        if not user_input or user_input.isspace():
+            return
+
+        if not suppress_logging:
+            self.log.print(">>> " + user_input, color=self.PRIMARY_TEXT_COLOR, mirror_to_stdout=True)
+
+        command_name, *args = shlex.split(user_input)
+
+        func = self.get_all_commands().get(command_name)
+        if func is None:
+            self.log.print(f"No command {command_name} exists in the current game.", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            return
+        if getattr(func, "_is_cheat_protected", False) and not self.cheats_enabled and not ignore_cheat_protection:
+            self.log.print(f"The command {command_name} is cheat protected.", color=self.HIGHLIGHT_COLOR, mirror_to_stdout=True)
+            return
+
+        plan: CommandPlan = get_command_plan(func)
+        try:
+            cast_args = plan.convert_args(args)
+        except ValueError as e:
+            self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            self.print_usage_string(func)
+            return
+
+        if getattr(func, "_run_in_background", False):
+            job: Job = self.jobs.submit(user_input, func, cast_args, in_process=getattr(func, "_run_in_process", False))
+            if not suppress_logging:
+                self.log.print(f"[job {job.job_id}] started in a {'worker process' if job.in_process else 'background thread'}", color=self.SECONDARY_TEXT_COLOR, mirror_to_stdout=True)
+            return
+
+        try:
+            return_value = func(*cast_args)
+            if inspect.isgenerator(return_value):
+                job: Job = self.jobs.submit_generator(user_input, func, return_value)
+                if not suppress_logging:
+                    self.log.print(f"[job {job.job_id}] started, resumed every frame", color=self.SECONDARY_TEXT_COLOR, mirror_to_stdout=True)
+                return
+            if getattr(func, "_show_return_value", False):
+                self.log.print(str(return_value), mirror_to_stdout=True)
+        except TypeError as e:
+            self.log.print(f"{e.__class__.__name__}: {str(e)}", color=self.ERROR_COLOR, mirror_to_stdout=True)
+            self.print_usage_string(func)
+            return
+
+    def poll_jobs(self) -> None:
+        """Resumes generator commands and writes the results of finished background commands to the log. Called by update()."""
+        for job, value in self.jobs.step_generators():
+            self.log.print(f"[job {job.job_id}] {value}", mirror_to_stdout=True)
+        for job in self.jobs.poll():
+            if job.cancel_event.is_set():
+                self.log.print(f"[job {job.job_id}] {job.command}: cancelled", color=self.HIGHLIGHT_COLOR, mirror_to_stdout=True)
+            elif (exception := job.future.exception()) is not None:
+                self.log.print(f"[job {job.job_id}] {job.command}: failed", color=self.ERROR_COLOR, mirror_to_stdout=True)
+                self.print_exception_to_log(exception)
+            else:
+                self.log.print(f"[job {job.job_id}] {job.command}: finished after {job.get_elapsed_time():.2f}s", mirror_to_stdout=True)
+                if getattr(job.func, "_show_return_value", False):
+                    self.log.print(str(job.future.result()), mirror_to_stdout=True)
+
+    @console_command("jobs")
+    def list_jobs(self) -> None:
+        """Lists all commands running in the background"""
+        if not self.jobs.jobs:
+            self.log.print("No background jobs are running.", mirror_to_stdout=True)
+            return
+        self.log.print_lines((f"[job {job.job_id}] {job.get_state():<10} {job.get_elapsed_time():>7.2f}s  {job.command}"
+                              for job in self.jobs.jobs.values()), mirror_to_stdout=True)
+
+    @console_command("job_budget")
+    def set_generator_budget(self, microseconds: int) -> None:
+        """Sets the time generator commands may spend per frame"""
+        self.jobs.generator_budget_us = max(0, microseconds)
+
+    @console_command("cancel")
+    def cancel_job(self, job_id: int) -> None:
+        """Cancels a background job. Running jobs stop once they check anaconsole.jobs.is_cancelled()"""
+        if not self.jobs.cancel(job_id):
+            self.log.print(f"No job with id {job_id} exists.", color=self.ERROR_COLOR, mirror_to_stdout=True)
+
+    def print_usage_string(self, func: Callable[..., Any]):
+        self.log.print(get_command_plan(func).usage_string, mirror_to_stdout=True)
@@ -0,0 +1,183 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from time import perf_counter, perf_counter_ns
+from typing import TYPE_CHECKING, Callable, Any, Generator
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+_current_job = threading.local()
+
+
+def is_cancelled() -> bool:
+    """Lets a background command check whether its job was cancelled, so it can return early."""
+    job: Job | None = getattr(_current_job, "job", None)
+    return job is not None and job.cancel_event.is_set()
+
+
+@dataclass
+class Job:
+    job_id: int
+    command: str
+    func: Callable[..., Any]
+    in_process: bool = False
+    generator: Generator[Any, None, Any] | None = None  # Set for cooperative jobs, which run on the main thread
+    future: Future = field(default_factory=Future)
+    start_time: float = field(default_factory=perf_counter)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+    def get_state(self) -> str:
+        if self.cancel_event.is_set():
+            return "cancelling"
+        if self.future.running():
+            return "running"
+        if self.future.done():
+            return "done"
+        return "pending"
+
+    def get_elapsed_time(self) -> float:
+        return perf_counter() - self.start_time
+
+
+def _warm_up() -> None:
+    pass
+
+
+class JobManager:
+    """
+    Runs console commands on a thread pool, or on a process pool for CPU-bound commands that would hold the GIL.
+    Finished jobs are collected on the main thread by poll(), so their results can be written to the log safely.
+    Worker processes are spawned, so the game's entry point has to be guarded by if __name__ == "__main__".
+    """
+    PROCESS_START_METHOD: str = "spawn"
+    GENERATOR_BUDGET_US: int = 2000
+
+    def __init__(self, max_workers: int = 4, max_processes: int | None = None):
+        self.max_workers: int = max_workers
+        self.max_processes: int | None = max_processes
+        self.generator_budget_us: int = self.GENERATOR_BUDGET_US
+        self.jobs: dict[int, Job] = dict()
+        self._generator_jobs: deque[Job] = deque()
+        self._thread_pool: "ThreadPoolExecutor | None" = None
+        self._process_pool: "ProcessPoolExecutor | None" = None
+        self._next_job_id: int = 1
+
+    def get_thread_pool(self) -> "ThreadPoolExecutor":
+        if self._thread_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="anaconsole-job")
+        return self._thread_pool
+
+    def get_process_pool(self) -> "ProcessPoolExecutor":
+        """Returns the process pool. It is created once and reused, so only the first job pays for spawning workers."""
+        if self._process_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_processes,
+                                                     mp_context=multiprocessing.get_context(self.PROCESS_START_METHOD))
+        return self._process_pool
+
+    def warm_up_process_pool(self) -> None:
+        """Starts the worker processes ahead of time, so the first process job does not wait for them to import."""
+        process_pool = self.get_process_pool()
+        for _ in range(self.max_processes or os.cpu_count() or 1):
+            process_pool.submit(_warm_up)
+
+    @staticmethod
+    def _run(job: Job, args: list[Any]) -> Any:
+        _current_job.job = job
+        try:
+            return job.func(*args)
+        finally:
+            _current_job.job = None
+
+    def submit(self, command: str, func: Callable[..., Any], args: list[Any], *, in_process: bool = False) -> Job:
+        """
+        Runs func(*args) on a worker thread, or in a worker process if in_process is set.
+        Process jobs pickle func (including the instance of bound methods), the arguments and the return value.
+        Pickling errors and exceptions raised in the worker are reported through the job's future.
+        """
+        job = Job(self._next_job_id, command, func, in_process)
+        self._next_job_id += 1
+        if in_process:
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                job.future = self.get_process_pool().submit(func, *args)
+            except BrokenProcessPool:  # A worker died, e.g. by a segfault. Start over with a fresh pool
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+                job.future = self.get_process_pool().submit(func, *args)
+        else:
+            job.future = self.get_thread_pool().submit(self._run, job, args)
+        self.jobs[job.job_id] = job
+        return job
+
+    def submit_generator(self, command: str, func: Callable[..., Any], generator: Generator[Any, None, Any]) -> Job:
+        """Adds a cooperative job. The generator is resumed by step_generators() on the main thread."""
+        job = Job(self._next_job_id, command, func, generator=generator)
+        self._next_job_id += 1
+        job.future.set_running_or_notify_cancel()
+        self.jobs[job.job_id] = job
+        self._generator_jobs.append(job)
+        return job
+
+    def step_generators(self) -> list[tuple[Job, Any]]:
+        """
+        Resumes the cooperative jobs in turn until the time budget of this frame is used up.
+        Every call resumes at least one job, so jobs make progress even if a single step exceeds the budget.
+        Returns the values yielded by the jobs, except for None, which only hands control back to the frame.
+        """
+        yielded_values: list[tuple[Job, Any]] = []
+        deadline_ns: int = perf_counter_ns() + self.generator_budget_us * 1000
+        first_step: bool = True
+        while self._generator_jobs and (first_step or perf_counter_ns() < deadline_ns):
+            first_step = False
+            job = self._generator_jobs.popleft()
+            if job.cancel_event.is_set():
+                job.generator.close()
+                job.future.set_result(None)
+                continue
+            try:
+                value = next(job.generator)
+            except StopIteration as e:
+                job.future.set_result(e.value)
+                continue
+            except Exception as e:
+                job.future.set_exception(e)
+                continue
+            if value is not None:
+                yielded_values.append((job, value))
+            self._generator_jobs.append(job)
+        return yielded_values
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancels a pending job, or asks a running job to stop. Returns False if there is no such job."""
+        job: Job | None = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.future.cancel()
+        job.cancel_event.set()
+        return True
+
+    def poll(self) -> list[Job]:
+        """Removes and returns all finished jobs. Must be called from the main thread."""
+        finished_jobs: list[Job] = [job for job in self.jobs.values() if job.future.done()]
+        for job in finished_jobs:
+            del self.jobs[job.job_id]
+        return finished_jobs
+
+    def shutdown(self) -> None:
+        for job in self.jobs.values():
+            job.cancel_event.set()
+        for job in self._generator_jobs:
+            job.generator.close()
+        self._generator_jobs.clear()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
@@ -0,0 +1,30 @@
+from functools import cache
+from types import ModuleType
+from typing import Callable, Any
+
+
+class LazyClassAttribute:
+    """
+    Class attribute whose value is computed by factory(owner) on first access, instead of at class definition time.
+    The value then replaces the descriptor on the class, so later accesses are plain attribute lookups.
+    """
+    def __init__(self, factory: Callable[[type], Any]):
+        self.factory: Callable[[type], Any] = factory
+        self.name: str = ""
+        self.owner: type | None = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self.factory(self.owner)
+        setattr(self.owner, self.name, value)
+        return value
+
+
+@cache
+def get_numpy() -> ModuleType:
+    """Imports numpy on first use, so it does not slow down startup. Later calls only return the cached module."""
+    import numpy
+    return numpy
@@ -0,0 +1,30 @@
+from bisect import bisect_left
+from typing import Iterable
+
+
+class PrefixIndex:
+    """
+    Sorted index of strings for prefix lookups in O(log n + k).
+    Matches are returned in lexicographic order, so shorter completions come before their extensions.
+    """
+    def __init__(self, keys: Iterable[str] = ()):
+        self._keys: list[str] = sorted(set(keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def find(self, prefix: str, limit: int | None = None, *, include_exact: bool = True) -> list[str]:
+        matches: list[str] = []
+        index = bisect_left(self._keys, prefix)
+        if not include_exact and index < len(self._keys) and self._keys[index] == prefix:
+            index += 1
+        while index < len(self._keys) and (limit is None or len(matches) < limit):
+            key = self._keys[index]
+            if not key.startswith(prefix):
+                break
+            matches.append(key)
+            index += 1
+        return matches
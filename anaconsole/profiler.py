@@ -0,0 +1,96 @@
+import functools
+from collections import defaultdict, deque
+from time import perf_counter_ns
+from typing import Callable, Any
+
+
+class Zone:
+    """A named profiling zone. Use it as a context manager or as a decorator."""
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler: "Profiler" = profiler
+        self.name: str = name
+
+    def __enter__(self) -> "Zone":
+        if self.profiler.enabled:
+            self.profiler._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
+        if self.profiler._stack:
+            self.profiler._pop(self)
+        return False
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class Profiler:
+    """
+    Collects the time spent in nested zones per frame and keeps a rolling history per zone.
+    Zones are identified by their path, e.g. "update/physics". While disabled, entering a zone only costs one check.
+    """
+    def __init__(self, history_length: int = 100):
+        self.enabled: bool = False
+        self.history_length: int = history_length
+        self.frame_count: int = 0
+        self.history: dict[str, deque[float]] = dict()  # Zone path -> frame times in milliseconds
+        self._zones: dict[str, Zone] = dict()
+        self._stack: list[tuple[Zone, str, int]] = []
+        self._frame_times_ns: defaultdict[str, int] = defaultdict(int)
+        self._viewer_count: int = 0
+        self._enabled_by_viewers: bool = False
+
+    def zone(self, name: str) -> Zone:
+        zone: Zone | None = self._zones.get(name)
+        if zone is None:
+            zone = self._zones[name] = Zone(self, name)
+        return zone
+
+    def _push(self, zone: Zone) -> None:
+        path: str = f"{self._stack[-1][1]}/{zone.name}" if self._stack else zone.name
+        self._stack.append((zone, path, perf_counter_ns()))
+
+    def _pop(self, zone: Zone) -> None:
+        if self._stack[-1][0] is not zone:
+            return  # The zone was entered while the profiler was disabled
+        _, path, start_time_ns = self._stack.pop()
+        self._frame_times_ns[path] += perf_counter_ns() - start_time_ns
+
+    def end_frame(self) -> None:
+        if not self.enabled and not self._frame_times_ns:
+            return
+        for path in self._frame_times_ns.keys() - self.history.keys():
+            self.history[path] = deque(maxlen=self.history_length)
+        for path, frame_times in self.history.items():
+            frame_times.append(self._frame_times_ns.get(path, 0) / 1e6)
+        self._frame_times_ns.clear()
+        self.frame_count += 1
+
+    def add_viewer(self) -> None:
+        """Enables the profiler while at least one viewer, e.g. a profiler window, is open."""
+        if self._viewer_count == 0:
+            self._enabled_by_viewers = not self.enabled
+        self._viewer_count += 1
+        self.enabled = True
+
+    def remove_viewer(self) -> None:
+        """Disables and resets the profiler once the last viewer is gone, unless it was already enabled before the first one."""
+        self._viewer_count -= 1
+        if self._viewer_count == 0 and self._enabled_by_viewers:
+            self._enabled_by_viewers = False
+            self.enabled = False
+            self.reset()
+
+    def reset(self) -> None:
+        self.history.clear()
+        self._stack.clear()
+        self._frame_times_ns.clear()
+
+    def get_summary(self) -> list[tuple[str, float, float]]:
+        """Returns (path, mean, max) in milliseconds for every zone, with nested zones following their parents."""
+        return [(path, sum(frame_times) / len(frame_times), max(frame_times))
+                for path, frame_times in sorted(self.history.items()) if frame_times]
@@ -0,0 +1,87 @@
+"""
+Command line client for the remote console.
+
+    python -m anaconsole.remote_client [--host HOST] [--port PORT | --unix PATH] [COMMAND ...]
+
+Runs the given commands and exits, or reads commands from stdin if none are given.
+"""
+import argparse
+import socket
+import sys
+import threading
+
+from anaconsole.remote_console import END_OF_RESPONSE, DEFAULT_PORT
+
+
+def connect(host: str, port: int, unix_socket_path: str | None) -> socket.socket:
+    if unix_socket_path:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(unix_socket_path)
+        return connection
+    connection = socket.create_connection((host, port))
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+class ResponseReader(threading.Thread):
+    """Prints everything the server sends and counts the finished commands."""
+    def __init__(self, connection: socket.socket):
+        super().__init__(daemon=True)
+        self.connection: socket.socket = connection
+        self.responses = threading.Semaphore(0)
+        self.closed = threading.Event()
+
+    def run(self) -> None:
+        with self.connection.makefile("r", encoding="utf-8", errors="replace") as stream:
+            for line in stream:
+                line = line.rstrip("\n")
+                if line == END_OF_RESPONSE:
+                    self.responses.release()
+                else:
+                    print(line, flush=True)
+        self.closed.set()
+
+    def wait_for_response(self) -> None:
+        while not self.responses.acquire(timeout=0.1):
+            if self.closed.is_set():
+                sys.exit("The server closed the connection.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sends commands to a running anaconsole remote console.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", dest="unix_socket_path", help="path of a unix socket to connect to instead")
+    parser.add_argument("commands", nargs="*", help="commands to run, e.g. \"echo hi\"")
+    args = parser.parse_args()
+
+    try:
+        connection = connect(args.host, args.port, args.unix_socket_path)
+    except OSError as e:
+        sys.exit(f"Could not connect: {e}")
+    reader = ResponseReader(connection)
+    reader.start()
+
+    if args.commands:
+        # Send everything at once, the server answers the commands in order
+        connection.sendall("".join(command + "\n" for command in args.commands).encode("utf-8"))
+        for _ in args.commands:
+            reader.wait_for_response()
+        return
+
+    interactive: bool = sys.stdin.isatty()
+    while True:
+        try:
+            command = input(">>> ") if interactive else sys.stdin.readline()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if not interactive and not command:
+            break
+        if not command.strip():
+            continue
+        connection.sendall((command.strip() + "\n").encode("utf-8"))
+        reader.wait_for_response()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import stat
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from anaconsole.headless_console import HeadlessConsole
+
+
+END_OF_RESPONSE: str = "\x1e"  # Sent on its own line once a command has been handled
+DEFAULT_PORT: int = 27015
+
+
+@dataclass(eq=False)
+class RemoteClient:
+    client_id: int
+    address: str
+    writer: asyncio.StreamWriter
+    output: list[str] = field(default_factory=list)  # Only accessed by the main thread
+
+
+class RemoteConsoleServer:
+    """
+    Line based console server that runs an asyncio event loop on a background thread.
+    Every line a client sends is a command, which is submitted to the console's CommandQueue and run on the main thread.
+    Everything the log prints while a client's command runs is sent to that client, followed by an END_OF_RESPONSE line.
+    Other log output is sent to all clients. Output is sent by flush_output(), which the overlay calls once per frame.
+    """
+    MAX_WRITE_BUFFER_SIZE: int = 4 * 1024 * 1024  # Clients that do not keep up with their output are disconnected
+
+    def __init__(self, dev_console: "HeadlessConsole", host: str = "127.0.0.1", port: int = DEFAULT_PORT, *,
+                 unix_socket_path: str | None = None):
+        self.dev_console: "HeadlessConsole" = dev_console
+        self.host: str = host
+        self.port: int = port
+        self.unix_socket_path: str | None = unix_socket_path
+
+        self.clients: dict[int, RemoteClient] = dict()
+        self._clients_lock = threading.Lock()
+        self._next_client_id: int = 1
+        self._broadcast_output: list[str] = []
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._start_error: BaseException | None = None
+
+    def start(self) -> None:
+        """Starts listening on a background thread. Raises OSError if the address cannot be bound."""
+        if self._thread is not None:
+            return
+        self.dev_console.log.listeners.append(self.on_log_line)
+        self._thread = threading.Thread(target=self._run_event_loop, name="anaconsole-remote-console", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._start_error is not None:
+            self.dev_console.log.listeners.remove(self.on_log_line)
+            self._thread = None
+            raise self._start_error
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self.dev_console.log.listeners.remove(self.on_log_line)
+
+    def get_address_string(self) -> str:
+        return self.unix_socket_path if self.unix_socket_path else f"{self.host}:{self.port}"
+
+    def _run_event_loop(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._server = self._loop.run_until_complete(self._start_server())
+        except OSError as e:
+            self._start_error = e
+            self._started.set()
+            self._loop.close()
+            return
+        if not self.unix_socket_path:
+            self.port = self._server.sockets[0].getsockname()[1]  # Resolves port 0 to the port that was picked
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            with self._clients_lock:
+                for client in self.clients.values():
+                    client.writer.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _start_server(self) -> asyncio.AbstractServer:
+        if self.unix_socket_path:
+            try:
+                if stat.S_ISSOCK(os.stat(self.unix_socket_path).st_mode):
+                    os.unlink(self.unix_socket_path)  # Left behind by a previous run
+            except FileNotFoundError:
+                pass
+            return await asyncio.start_unix_server(self._handle_client, self.unix_socket_path)
+        return await asyncio.start_server(self._handle_client, self.host, self.port)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        with self._clients_lock:
+            client = RemoteClient(self._next_client_id, str(writer.get_extra_info("peername") or "unix socket"), writer)
+            self._next_client_id += 1
+            self.clients[client.client_id] = client
+        try:
+            async for line in reader:
+                command = line.decode("utf-8", errors="replace").strip()
+                if command:
+                    self.dev_console.command_queue.submit(command, suppress_logging=True, on_output=client.output.append,
+                                                          callback=lambda _, client=client: client.output.append(END_OF_RESPONSE))
+        except (ConnectionError, ValueError):  # ValueError: line longer than the reader's limit
+            pass
+        finally:
+            with self._clients_lock:
+                self.clients.pop(client.client_id, None)
+            writer.close()
+
+    def _send(self, client: RemoteClient, data: bytes) -> None:
+        """Runs on the event loop thread."""
+        if client.writer.is_closing():
+            return
+        client.writer.write(data)
+        if client.writer.transport.get_write_buffer_size() > self.MAX_WRITE_BUFFER_SIZE:
+            client.writer.close()
+
+    def on_log_line(self, string: str) -> None:
+        if self.dev_console.command_queue.current is None and self.clients:
+            self._broadcast_output.append(string)
+
+    def flush_output(self) -> None:
+        """Sends the output collected since the last call to the clients. Must be called from the main thread."""
+        if self._thread is None:
+            return
+        with self._clients_lock:
+            clients = list(self.clients.values())
+        broadcast_output = self._broadcast_output
+        self._broadcast_output = []
+        for client in clients:
+            if not client.output and not broadcast_output:
+                continue
+            data: bytes = ("\n".join(broadcast_output + client.output) + "\n").encode("utf-8")
+            client.output.clear()
+            self._loop.call_soon_threadsafe(self._send, client, data)
@@ -0,0 +1,22 @@
+import pygame as pg
+from typing import Sequence
+
+
+class GridIndex:
+    """
+    Uniform grid over a list of rects for point queries. Every cell stores the indices of the rects that overlap it,
+    in ascending order, so query results keep the order of the original list.
+    """
+    def __init__(self, rects: Sequence[pg.Rect], cell_size: int = 64):
+        self.cell_size: int = cell_size
+        self.cells: dict[tuple[int, int], list[int]] = dict()
+        for index, rect in enumerate(rects):
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            for cell_x in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+                for cell_y in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                    self.cells.setdefault((cell_x, cell_y), []).append(index)
+
+    def query_point(self, pos: tuple[int, int]) -> list[int]:
+        """Returns the indices of all rects whose cell contains pos. They still have to be checked with collidepoint."""
+        return self.cells.get((int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size), [])
@@ -0,0 +1,48 @@
+import pygame as pg
+from collections import OrderedDict
+from typing import Any
+
+
+ColorType = tuple[int, int, int] | tuple[int, int, int, int] | pg.Color
+
+
+class TextCache:
+    """
+    LRU cache for rendered text surfaces, shared by all widgets.
+    Surfaces returned by the cache are shared between callers and must be treated as read-only.
+    """
+    def __init__(self, max_size: int = 2048):
+        self.max_size: int = max_size
+        self._surfaces: OrderedDict[tuple[Any, ...], pg.Surface] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def render(self, font: pg.font.Font, text: str, antialias: bool, color: ColorType,
+               background: ColorType | None = None) -> pg.Surface:
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None, font.italic)
+        surface: pg.Surface | None = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self._surfaces[key] = surface
+        while len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+    def get_stats_string(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"{len(self._surfaces)}/{self.max_size} surfaces, {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evictions ({hit_rate:.1%} hit rate)")
+
+
+text_cache = TextCache()
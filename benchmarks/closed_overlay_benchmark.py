@@ -0,0 +1,64 @@
+"""
+Measures what the closed overlay costs per event for a typical 60 Hz input stream: mostly mouse motion,
+some key presses that are not bound and window events the overlay does not care about.
+Compares the closed-state dispatch table with the full element tree dispatch, with and without a pinned window.
+
+    python benchmarks/closed_overlay_benchmark.py
+"""
+import os
+import random
+import time
+import pygame as pg
+from anaconsole import DeveloperOverlay
+from anaconsole.elements import BaseElement
+
+FRAME_COUNT = 6000  # 100 seconds of input at 60 Hz
+SCREEN_SIZE = (1280, 720)
+
+
+def generate_input_stream() -> list[pg.event.Event]:
+    random.seed(0)
+    events: list[pg.event.Event] = []
+    x, y = SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2
+    for frame in range(FRAME_COUNT):
+        for _ in range(4):  # 240 Hz mouse
+            rel = (random.randint(-5, 5), random.randint(-5, 5))
+            x, y = min(max(x + rel[0], 0), SCREEN_SIZE[0] - 1), min(max(y + rel[1], 0), SCREEN_SIZE[1] - 1)
+            events.append(pg.event.Event(pg.MOUSEMOTION, pos=(x, y), rel=rel, buttons=(0, 0, 0)))
+        if frame % 10 == 0:
+            key = random.choice((pg.K_w, pg.K_a, pg.K_s, pg.K_d))
+            events.append(pg.event.Event(pg.KEYDOWN, key=key, scancode=4, mod=0, unicode=""))
+            events.append(pg.event.Event(pg.KEYUP, key=key, scancode=4, mod=0, unicode=""))
+        if frame % 30 == 0:
+            events.append(pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(x, y), button=1))
+            events.append(pg.event.Event(pg.MOUSEBUTTONUP, pos=(x, y), button=1))
+        if frame % 60 == 0:
+            events.append(pg.event.Event(pg.WINDOWMOVED, x=0, y=0))
+    return events
+
+
+def time_dispatch(dispatch, events: list[pg.event.Event]) -> float:
+    start = time.perf_counter_ns()
+    for event in events:
+        dispatch(event)
+    return (time.perf_counter_ns() - start) / len(events)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.init()
+    overlay = DeveloperOverlay(pg.display.set_mode(SCREEN_SIZE))
+    events = generate_input_stream()
+
+    def full_dispatch(event: pg.event.Event) -> bool:
+        return BaseElement._trickle_down_event(overlay, event)
+
+    print(f"{'':<20} {'full ns/event':>14} {'fast path ns/event':>19}")
+    for pinned_window_count in (0, 1):
+        if pinned_window_count:
+            overlay.dev_console.open_profiler_window()
+            overlay.children[-1].pinned = True
+            overlay.render()  # Refreshes the pinned windows
+        full = time_dispatch(full_dispatch, events)
+        fast = time_dispatch(overlay._trickle_down_event, events)
+        print(f"{f'{pinned_window_count} pinned window(s)':<20} {full:>14.0f} {fast:>19.0f}")
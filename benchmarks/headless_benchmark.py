@@ -0,0 +1,67 @@
+"""
+Compares a HeadlessConsole with a DeveloperOverlay on an unseen surface, as dedicated servers used to run it:
+the memory allocated per instance and the time per command that prints a line.
+Python allocations are traced with tracemalloc, surfaces are allocated by SDL and only show up in the resident set size,
+which is read from /proc and therefore only reported on Linux.
+
+    python benchmarks/headless_benchmark.py
+"""
+import os
+import time
+import tracemalloc
+import pygame as pg
+from anaconsole import DeveloperOverlay, HeadlessConsole
+
+INSTANCE_COUNT = 20
+COMMAND_COUNT = 5000
+SCREEN_SIZE = (1280, 720)
+
+
+def get_resident_set_size() -> int | None:
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def measure_memory(create) -> tuple[float, float | None]:
+    """Returns the KiB of Python allocations and of resident memory per instance, while all instances are alive."""
+    create()  # Loads modules and shared assets, so they do not count towards the instances
+    resident_before = get_resident_set_size()
+    tracemalloc.start()
+    instances = [create() for _ in range(INSTANCE_COUNT)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resident_after = get_resident_set_size()
+    del instances
+    resident = (resident_after - resident_before) / INSTANCE_COUNT / 1024 if resident_before is not None else None
+    return allocated / INSTANCE_COUNT / 1024, resident
+
+
+def time_commands(console) -> float:
+    start = time.perf_counter_ns()
+    for i in range(COMMAND_COUNT):
+        console.handle_command(f"eval {i}")
+    return (time.perf_counter_ns() - start) / COMMAND_COUNT
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.init()
+
+    def create_overlay() -> DeveloperOverlay:
+        return DeveloperOverlay(pg.Surface(SCREEN_SIZE), enable_cheats=True)
+
+    def create_headless_console() -> HeadlessConsole:
+        return HeadlessConsole(enable_cheats=True, mirror_to_stdout=False)
+
+    overlay = create_overlay()
+    overlay.dev_console.log.mirror_enabled = False
+    headless_console = create_headless_console()
+    print(f"{'':<20} {'python KiB/instance':>20} {'resident KiB/instance':>22} {'ns/command':>11}")
+    for name, create, console in (("HeadlessConsole", create_headless_console, headless_console),
+                                  ("DeveloperOverlay", create_overlay, overlay.dev_console)):
+        allocated, resident = measure_memory(create)
+        resident_string = f"{resident:.1f}" if resident is not None else "n/a"
+        print(f"{name:<20} {allocated:>20.1f} {resident_string:>22} {time_commands(console):>11.0f}")
@@ -0,0 +1,58 @@
+"""
+Compares the cost of dispatching mouse clicks to a container with 10, 100 and 1000 children,
+with a linear collidepoint scan and with the GridIndex hit-testing index.
+
+    python benchmarks/hit_testing_benchmark.py
+"""
+import os
+import random
+import time
+import pygame as pg
+from anaconsole import DeveloperOverlay
+from anaconsole.elements import BaseElement
+
+EVENT_COUNT = 20000
+CONTAINER_SIZE = (1280, 720)
+
+
+class LinearContainer(BaseElement):
+    HIT_INDEX_MIN_CHILDREN = None
+
+
+class IndexedContainer(BaseElement):
+    HIT_INDEX_MIN_CHILDREN = 1
+
+
+def build_container(container_type: type[BaseElement], overlay: DeveloperOverlay, child_count: int) -> BaseElement:
+    container = container_type(overlay, overlay, pg.Rect((0, 0), CONTAINER_SIZE))
+    columns = int((child_count * CONTAINER_SIZE[0] / CONTAINER_SIZE[1]) ** 0.5) + 1
+    rows = child_count // columns + 1
+    width, height = CONTAINER_SIZE[0] // columns, CONTAINER_SIZE[1] // rows
+    for i in range(child_count):
+        rect = pg.Rect((i % columns) * width, (i // columns) * height, width - 1, height - 1)
+        container.children.append(BaseElement(overlay, container, rect))
+    return container
+
+
+def time_dispatch(container: BaseElement, positions: list[tuple[int, int]]) -> float:
+    events = [pg.event.Event(pg.MOUSEBUTTONDOWN, pos=pos, button=1) for pos in positions]
+    start = time.perf_counter_ns()
+    for event in events:
+        container._trickle_down_event(event)
+    return (time.perf_counter_ns() - start) / len(events)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.init()
+    overlay = DeveloperOverlay(pg.display.set_mode(CONTAINER_SIZE))
+    random.seed(0)
+    positions = [(random.randrange(CONTAINER_SIZE[0]), random.randrange(CONTAINER_SIZE[1])) for _ in range(EVENT_COUNT)]
+
+    print(f"{'children':>8} {'linear ns/event':>16} {'indexed ns/event':>17} {'speedup':>8}")
+    for child_count in (10, 100, 1000):
+        linear = time_dispatch(build_container(LinearContainer, overlay, child_count), positions)
+        indexed_container = build_container(IndexedContainer, overlay, child_count)
+        time_dispatch(indexed_container, positions[:1])  # Builds the index
+        indexed = time_dispatch(indexed_container, positions)
+        print(f"{child_count:>8} {linear:>16.0f} {indexed:>17.0f} {linear / indexed:>7.1f}x")
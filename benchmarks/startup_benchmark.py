@@ -0,0 +1,62 @@
+"""
+Measures the cold start cost of anaconsole in fresh interpreters: the time to import the package (after pygame,
+which every user imports anyway) and the time to construct a DeveloperOverlay, eagerly and with lazy_ui.
+Exits with status 1 if any median exceeds its threshold, so it can guard against startup regressions.
+
+    python benchmarks/startup_benchmark.py [--runs 7] [--import-threshold-ms 80] [--construction-threshold-ms 60]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORT_THRESHOLD_MS = 80.0
+CONSTRUCTION_THRESHOLD_MS = 60.0
+
+MEASUREMENT_SCRIPT = """
+import time
+import pygame
+start = time.perf_counter()
+import anaconsole
+imported = time.perf_counter()
+pygame.init()
+surface = pygame.Surface((1280, 720))
+constructing = time.perf_counter()
+anaconsole.DeveloperOverlay(surface)
+constructed = time.perf_counter()
+anaconsole.DeveloperOverlay(surface, lazy_ui=True)
+lazily_constructed = time.perf_counter()
+print((imported - start) * 1000, (constructed - constructing) * 1000, (lazily_constructed - constructed) * 1000)
+"""
+
+
+def measure_once() -> tuple[float, float, float]:
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-c", MEASUREMENT_SCRIPT], capture_output=True, text=True,
+                            env=environment, check=True)
+    import_ms, construction_ms, lazy_construction_ms = result.stdout.split()[-3:]
+    return float(import_ms), float(construction_ms), float(lazy_construction_ms)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--import-threshold-ms", type=float, default=IMPORT_THRESHOLD_MS)
+    parser.add_argument("--construction-threshold-ms", type=float, default=CONSTRUCTION_THRESHOLD_MS)
+    args = parser.parse_args()
+
+    measure_once()  # Writes the bytecode caches, so compiling does not count towards the first run
+    measurements = [measure_once() for _ in range(args.runs)]
+    import_ms = statistics.median(measurement[0] for measurement in measurements)
+    construction_ms = statistics.median(measurement[1] for measurement in measurements)
+    lazy_construction_ms = statistics.median(measurement[2] for measurement in measurements)
+
+    failed = False
+    for name, value, threshold in (("import anaconsole", import_ms, args.import_threshold_ms),
+                                   ("DeveloperOverlay()", construction_ms, args.construction_threshold_ms),
+                                   ("lazy_ui=True", lazy_construction_ms, args.construction_threshold_ms)):
+        status = "ok" if value <= threshold else "REGRESSION"
+        failed |= value > threshold
+        print(f"{name:<20} {value:8.1f} ms (median of {args.runs}, threshold {threshold:.0f} ms) {status}")
+    sys.exit(1 if failed else 0)
@@ -1,10 +1,9 @@
-from anaconsole import DeveloperOverlay
-import pygame
+from anaconsole import HeadlessConsole
 
 
 if __name__ == '__main__':
-    pygame.init()
-    dev_overlay = DeveloperOverlay(pygame.Surface((1280, 720)), enable_cheats=True)
+    console = HeadlessConsole(enable_cheats=True, output_sinks=[print], mirror_to_stdout=False)
     while True:
         string = input(">>> ")
-        dev_overlay.dev_console.handle_command(string, suppress_logging=True)
+        console.handle_command(string, suppress_logging=True)
+        console.update()
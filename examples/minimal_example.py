@@ -49,9 +49,7 @@ if __name__ == "__main__":
                                   target_framerate=FRAMERATE)
     clock = pygame.time.Clock()
     while True:
-        for event in pygame.event.get():
-            if anaconsole._trickle_down_event(event):
-                continue
+        for event in anaconsole.process_events(pygame.event.get()):
             example_game.handle_event(event)
         example_game.update()
         example_game.render()
@@ -0,0 +1,16 @@
+from anaconsole import HeadlessConsole
+import pygame
+
+
+# Dedicated server style game loop without a window. Connect with
+#   python -m anaconsole.remote_client "eval 1 + 1"
+if __name__ == '__main__':
+    console = HeadlessConsole(enable_cheats=True, capture_stdout=True)
+    console.start_remote_console(port=27015)
+    clock = pygame.time.Clock()
+    try:
+        while True:
+            console.update()
+            clock.tick(60)
+    finally:
+        console.close()